@@ -0,0 +1,337 @@
+"""
+    sphinxcontrib.hy_cache
+    ~~~~~~~~~~~~~~~~~~~~~~
+    Bounded caches shared by the Hy domain and the Hy documenters.
+
+    Caches are registered by name so that they can all be reset when a build
+    starts and their statistics reported when it finishes.  A cache may be
+    backed by a :class:`DiskCache`, which keeps entries across builds.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+import hy
+
+logger = logging.getLogger("hy-domain")
+
+_caches = {}  # type: Dict[str, BuildCache]
+
+
+class CachedFailure:
+    """A negative cache entry remembering the exception a computation raised."""
+
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+    def reraise(self):
+        raise self.exc.with_traceback(None)
+
+
+# Returned by lookups that found nothing, as None is a valid cached value
+MISSING = object()
+
+
+class DiskCache:
+    """A content-addressed store of JSON files, one per entry.
+
+    Keys are hashed together with a *salt* (typically the versions the
+    entries depend on) to form file names.  Files are written atomically, so
+    parallel build processes can share the directory, and their modification
+    time is refreshed on every read so that :meth:`evict` can drop the least
+    recently used ones.
+    """
+
+    def __init__(
+        self,
+        dump: Callable[[Any], Any],
+        load: Callable[[Any], Any],
+        failures: Tuple[Type[BaseException], ...] = (),
+    ):
+        self.dump = dump
+        self.load = load
+        self.failures = failures
+        self.directory = None  # type: Optional[str]
+        self.maxsize = 0
+        self.salt = ""
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, directory: Optional[str], maxsize: int, salt: str) -> None:
+        """Point the cache at *directory*, or disable it if that is None."""
+        self.directory = directory
+        self.maxsize = maxsize
+        self.salt = salt
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256((self.salt + "\0" + key).encode("utf-8"))
+        return os.path.join(self.directory, digest.hexdigest() + ".json")
+
+    def get(self, key: str) -> Any:
+        """Return the stored value, a :class:`CachedFailure` or ``MISSING``."""
+        if not self.directory:
+            return MISSING
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return MISSING
+
+        self.hits += 1
+        if "failure" in entry:
+            name, message = entry["failure"]
+            for exc_type in self.failures:
+                if exc_type.__name__ == name:
+                    return CachedFailure(exc_type(message))
+            return MISSING
+        return self.load(entry["value"])
+
+    def set(self, key: str, value: Any) -> None:
+        if not self.directory:
+            return
+
+        if isinstance(value, CachedFailure):
+            name = next(
+                exc_type.__name__
+                for exc_type in self.failures
+                if isinstance(value.exc, exc_type)
+            )
+            entry = {"failure": [name, str(value.exc)]}
+        else:
+            entry = {"value": self.dump(value)}
+
+        fd, tmpname = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmpname, self._path(key))
+        except (OSError, TypeError, ValueError) as exc:
+            logger.debug("[hy-cache] could not store %r: %s", key, exc)
+            try:
+                os.remove(tmpname)
+            except OSError:
+                pass
+
+    def evict(self) -> None:
+        """Remove the least recently used entries beyond *maxsize*."""
+        if not self.directory:
+            return
+
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    continue
+        if len(entries) <= self.maxsize:
+            return
+
+        entries.sort()
+        for mtime, path in entries[: len(entries) - self.maxsize]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class BuildCache:
+    """A least-recently-used mapping with hit/miss counters.
+
+    When *scoped* is true the cache is emptied at the start of every build,
+    otherwise only its counters are reset.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 4096,
+        scoped: bool = True,
+        disk: Optional[DiskCache] = None,
+    ):
+        self.name = name
+        self.maxsize = maxsize
+        self.scoped = scoped
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict[Hashable, Any]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def lookup(
+        self,
+        key: Hashable,
+        compute: Callable[[], Any],
+        failures: Tuple[Type[BaseException], ...] = (),
+    ) -> Any:
+        """Return the cached value for *key*, computing it on a miss.
+
+        Exceptions of the types in *failures* are cached as well and raised
+        again on every later lookup of the same key.
+        """
+        value = self.fetch(key)
+        if value is MISSING:
+            try:
+                value = compute()
+            except failures as exc:
+                value = CachedFailure(exc)
+            self.store(key, value)
+
+        if isinstance(value, CachedFailure):
+            value.reraise()
+        return value
+
+    def fetch(self, key: Hashable) -> Any:
+        """Return the entry for *key* from memory or disk, or ``MISSING``."""
+        value = self.get(key, MISSING)
+        if value is MISSING and self.disk:
+            value = self.disk.get(key)
+            if value is not MISSING:
+                self.set(key, value)
+        return value
+
+    def store(self, key: Hashable, value: Any) -> None:
+        """Add an entry to memory and disk."""
+        self.set(key, value)
+        if self.disk:
+            self.disk.set(key, value)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def reset_stats(self) -> None:
+        self.hits = self.misses = 0
+
+
+def build_cache(
+    name: str,
+    maxsize: int = 4096,
+    scoped: bool = True,
+    disk: Optional[DiskCache] = None,
+) -> BuildCache:
+    """Create and register a named cache."""
+    cache = _caches[name] = BuildCache(name, maxsize, scoped, disk)
+    return cache
+
+
+def reset_caches(app) -> None:
+    """Empty the build-scoped caches; connected to ``builder-inited``."""
+    for cache in _caches.values():
+        if cache.scoped:
+            cache.clear()
+        cache.reset_stats()
+        if cache.disk:
+            cache.disk.hits = cache.disk.misses = 0
+
+
+def report_caches(app, exception) -> None:
+    """Log the hit/miss counts of every cache; connected to ``build-finished``."""
+    for name, cache in sorted(_caches.items()):
+        lookups = cache.hits + cache.misses
+        if not lookups:
+            continue
+        logger.info(
+            "[hy-cache] %s: %d hits, %d misses (%.1f%% hit rate, %d entries)",
+            name,
+            cache.hits,
+            cache.misses,
+            100.0 * cache.hits / lookups,
+            len(cache),
+        )
+        if cache.disk and cache.disk.hits + cache.disk.misses:
+            logger.info(
+                "[hy-cache] %s (disk): %d hits, %d misses",
+                name,
+                cache.disk.hits,
+                cache.disk.misses,
+            )
+
+
+def evict_caches(app, exception) -> None:
+    """Trim the disk caches to their size; connected to ``build-finished``."""
+    for cache in _caches.values():
+        if cache.disk:
+            cache.disk.evict()
+
+
+digest_cache = build_cache("file-digests", maxsize=16384, scoped=False)
+
+
+def file_digest(filename: str) -> Optional[str]:
+    """Return the SHA-256 of the content of *filename*, or None if it cannot
+    be read.  Digests are memoized by path, modification time and size."""
+    try:
+        st = os.stat(filename)
+    except OSError:
+        return None
+
+    key = (filename, st.st_mtime_ns, st.st_size)
+    digest = digest_cache.get(key)
+    if digest is None:
+        try:
+            with open(filename, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return None
+        digest_cache.set(key, digest)
+    return digest
+
+
+# Name mangling is pure, so translations are kept across builds.  Under a
+# parallel build every process fills its own copy.
+mangle_cache = build_cache("mangle", maxsize=65536, scoped=False)
+unmangle_cache = build_cache("unmangle", maxsize=65536, scoped=False)
+
+
+def mangle(name: str) -> str:
+    """A memoized :func:`hy.mangle`."""
+    mangled = mangle_cache.get(name)
+    if mangled is None:
+        mangled = hy.mangle(name)
+        mangle_cache.set(name, mangled)
+    return mangled
+
+
+def unmangle(name: str) -> str:
+    """A memoized :func:`hy.unmangle`."""
+    unmangled = unmangle_cache.get(name)
+    if unmangled is None:
+        unmangled = hy.unmangle(name)
+        unmangle_cache.set(name, unmangled)
+    return unmangled
@@ -1,18 +1,37 @@
 import builtins
+import importlib.machinery
+import importlib.util
 import logging
-import re
+import os
+import sys
+import sysconfig
 import traceback
 import types
-from inspect import getfullargspec
+import weakref
+from inspect import Parameter, getfullargspec, unwrap
 from itertools import islice, starmap
-from typing import Any, Callable, Dict, List, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
-import hy
-import hy.core.macros
 from docutils.nodes import Node
-from sphinx.ext.autodoc import ALL
+from docutils.utils import relative_path
+from sphinx.errors import PycodeError
+from sphinx.ext.autodoc import ALL, INSTANCEATTR
 from sphinx.ext.autodoc import AttributeDocumenter as PyAttributeDocumenter
 from sphinx.ext.autodoc import ClassDocumenter as PyClassDocumenter
+from sphinx.ext.autodoc import DataDocumenter as PyDataDocumenter
 from sphinx.ext.autodoc import DecoratorDocumenter as PyDecoratorDocumenter
 from sphinx.ext.autodoc import Documenter as PyDocumenter
 from sphinx.ext.autodoc import FunctionDocumenter as PyFunctionDocumenter
@@ -31,6 +50,7 @@ from sphinx.ext.autodoc.directive import (
 from sphinx.ext.autodoc.importer import Attribute, import_module
 from sphinx.ext.autodoc.mock import mock
 from sphinx.locale import __
+from sphinx.pycode import ModuleAnalyzer
 from sphinx.util import inspect
 from sphinx.util.inspect import (
     getall,
@@ -38,34 +58,103 @@ from sphinx.util.inspect import (
     getmro,
     getslots,
     isenumclass,
+    object_description,
     safe_getattr,
 )
 from sphinx.util.typing import is_system_TypeVar
 
+from sphinxcontrib.hy_cache import MISSING, build_cache, file_digest, mangle, unmangle
+from sphinxcontrib.hy_source import HyModuleAnalyzer, Unsupported, read_module
+
 logger = logging.getLogger("hy-domain")
 
-hy_ext_sig_re = re.compile(
-    r"""
-^\(
-    (?:\s*\^(?P<retann>\(.*?\) | .*?)\s+)?     # Optional: return annotation
-    (?P<module>[\w.]+::)?                       # Explicit module name
-    (?P<classes>.*\.)?                         # Module and/or class name(s)
-    (?P<object>.+?) \s*                        # Thing name
-    (?:                                        # Arguments/close or just close
-      (?:\[(?:\s*(?P<arguments>.*)\s*\]\))?) | # Optional: arguments
-      (?:\)))
-$
-""",
-    re.VERBOSE,
-)
 
-hy_var_sig_re = re.compile(
-    r"""^ (?P<module>[\w.]+::)?   # Explicit module name
-          (?P<classes>.*\.)? # Module and/or class name(s)
-          (?P<object>.+?)        # thing name
-        $""",
-    re.VERBOSE,
-)
+class HySignature(NamedTuple):
+    retann: Optional[str]
+    module: Optional[str]
+    classes: Optional[str]
+    name: str
+    arguments: Optional[str]
+    sexp: bool
+
+
+def _skip_space(text: str, pos: int) -> int:
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _match_paren(text: str, pos: int) -> int:
+    """Return the index just past the form opened at *pos*, or -1."""
+    depth = 0
+    in_string = False
+    while pos < len(text):
+        char = text[pos]
+        if in_string:
+            if char == "\\":
+                pos += 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return -1
+
+
+def _split_name(token: str) -> Tuple[Optional[str], Optional[str], str]:
+    """Split ``module::classes.name`` into its three parts."""
+    module = None
+    sep = token.find("::")
+    if sep > 0 and all(c.isalnum() or c in "_." for c in token[:sep]):
+        module, token = token[: sep + 2], token[sep + 2 :]
+    dot = token.rfind(".", 0, len(token) - 1)
+    return module, token[: dot + 1] or None, token[dot + 1 :]
+
+
+def scan_hy_sig(sig: str) -> Optional[HySignature]:
+    """Split a signature like ``(^retann module::Class.name [args])`` or a bare
+    ``module::Class.name`` into its parts in a single pass.
+    Returns None if *sig* is not a valid signature.
+    """
+    sig = sig.strip()
+    if not (sig.startswith("(") and sig.endswith(")")):
+        if not sig:
+            return None
+        return HySignature(None, *_split_name(sig), None, False)
+
+    body = sig[1:-1]
+    pos = _skip_space(body, 0)
+    retann = None
+    if body.startswith("^", pos) and pos + 1 < len(body):
+        if body[pos + 1] == "(":
+            end = _match_paren(body, pos + 1)
+        else:
+            end = pos + 1
+            while end < len(body) and not body[end].isspace():
+                end += 1
+        if end > pos + 1 and end < len(body) and body[end].isspace():
+            retann = body[pos + 1 : end]
+            pos = _skip_space(body, end)
+
+    # the name runs up to the first bracket, provided that the remainder
+    # is a closed argument list, otherwise it takes up the whole form
+    body = body.rstrip()
+    token, arguments = body[pos:], None
+    bracket = body.find("[", pos + 1)
+    if bracket != -1 and body.endswith("]"):
+        token = body[pos:bracket].rstrip()
+        arguments = body[bracket + 1 : -1].strip() or None
+    if not token:
+        return None
+
+    return HySignature(retann, *_split_name(token), arguments, True)
+
 
 NoneType = type(None)
 
@@ -107,7 +196,7 @@ def get_object_members(subject: Any, objpath: List[str], attrgetter, analyzer=No
         try:
             value = attrgetter(subject, name)
             directly_defined = name in obj_dict
-            name = hy.unmangle(name)
+            name = unmangle(name)
             if name and name not in members:
                 members[name] = Attribute(name, directly_defined, value)
         except AttributeError:
@@ -117,7 +206,7 @@ def get_object_members(subject: Any, objpath: List[str], attrgetter, analyzer=No
     for i, cls in enumerate(getmro(subject)):
         try:
             for name in getannotations(cls):
-                name = hy.unmangle(cls, name)
+                name = unmangle(name)
                 if name and name not in members:
                     members[name] = Attribute(name, i == 0, INSTANCEATTR)
         except AttributeError:
@@ -134,15 +223,119 @@ def get_object_members(subject: Any, objpath: List[str], attrgetter, analyzer=No
 
 
 def match_hy_sig(s: str) -> tuple:
-    match = hy_ext_sig_re.match(s)
-    if match:
-        return match.groups()
+    match = scan_hy_sig(s)
+    if match is None:
+        raise AttributeError()
+
+    return match.module, match.classes, match.name, match.arguments, match.retann
+
+
+# Imports are attempted once per build: (modname, mock_imports) -> module,
+# and (modname, objpath, objtype, attrgetter, warningiserror, macro, tag,
+# static, mock_imports) -> [module, parent, name, object], failures included
+module_cache = build_cache("modules", maxsize=4096)
+object_cache = build_cache("objects", maxsize=16384)
+
+# (modname, filename, digest) -> stand-in module read from the Hy source, or
+# None if it has to be imported
+static_cache = build_cache("static-modules", maxsize=1024, scoped=False)
+
+
+def _find_spec(modname: str) -> Any:
+    """Find the spec of *modname* on the path without importing its parent
+    packages.  Returns None if the top-level package is not on the path."""
+    path = None
+    spec = None
+    parts = modname.split(".")
+    for i in range(len(parts)):
+        if i > 0 and path is None:
+            exc = ModuleNotFoundError(f"No module named {modname!r}", name=modname)
+            raise ImportError(exc, "")
+        try:
+            spec = importlib.machinery.PathFinder.find_spec(
+                ".".join(parts[: i + 1]), path
+            )
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None and i > 0:
+            exc = ModuleNotFoundError(f"No module named {modname!r}", name=modname)
+            raise ImportError(exc, "")
+        if spec is None:
+            return None
+        path = spec.submodule_search_locations
+    return spec
+
+
+def _hy_origin(spec: Any) -> Optional[str]:
+    """Return the ``.hy`` file a module spec loads, if it is one."""
+    if spec is not None and spec.has_location and spec.origin:
+        if spec.origin.endswith(".hy"):
+            return spec.origin
+    return None
+
+
+def _static_module(modname: str) -> Any:
+    """Return a stand-in for *modname* read from its Hy source without
+    executing it, or None if the module has to be imported."""
+    filename = _hy_origin(_find_spec(modname))
+    if filename is None:
+        return None
+
+    def read() -> Any:
+        try:
+            return read_module(filename, modname)
+        except Unsupported as exc:
+            logger.info("[autodoc] importing %s: %s", modname, exc)
+            return None
+
+    return static_cache.lookup((modname, filename, file_digest(filename)), read)
 
-    match = hy_var_sig_re.match(s)
-    if match:
-        return (*match.groups(), None, None)
 
-    raise AttributeError()
+# (modname, filename, digest) -> HyModuleAnalyzer, or the PycodeError raised
+# analyzing the source
+analyzer_cache = build_cache("analyzers", maxsize=1024, scoped=False)
+
+
+def prime_module_analyzer(modname: str) -> None:
+    """Have Sphinx's ``ModuleAnalyzer.for_module(modname)`` return a
+    :class:`HyModuleAnalyzer` if *modname* is a Hy source, rather than
+    importing the module and failing to parse it as Python."""
+    try:
+        filename = _hy_origin(_find_spec(modname))
+    except ImportError:
+        return
+    if filename is None:
+        return
+
+    def analyze() -> Any:
+        try:
+            with open(filename, encoding="utf-8") as f:
+                analyzer = HyModuleAnalyzer.for_string(f.read(), modname, filename)
+            analyzer.analyze()
+            return analyzer
+        except (OSError, PycodeError) as exc:
+            return exc if isinstance(exc, PycodeError) else PycodeError(str(exc))
+
+    ModuleAnalyzer.cache["module", modname] = analyzer_cache.lookup(
+        (modname, filename, file_digest(filename)), analyze
+    )
+
+
+def _import_module(
+    modname: str,
+    warningiserror: bool = False,
+    static: bool = False,
+    mock_imports: Tuple[str, ...] = (),
+) -> Any:
+    if static:
+        module = _static_module(modname)
+        if module is not None:
+            return module
+    return module_cache.lookup(
+        (modname, mock_imports),
+        lambda: import_module(modname, warningiserror=warningiserror),
+        (ImportError,),
+    )
 
 
 def import_object(
@@ -153,6 +346,52 @@ def import_object(
     warningiserror: bool = False,
     macro: bool = False,
     tag: bool = False,
+    static: bool = False,
+    mock_imports: Sequence[str] = (),
+) -> Any:
+    mock_imports = tuple(mock_imports)
+
+    def compute() -> Any:
+        # a memoized import must never run without the mocks in place
+        with mock(list(mock_imports)):
+            return _import_object(
+                modname,
+                objpath,
+                objtype,
+                attrgetter,
+                warningiserror,
+                macro,
+                tag,
+                static,
+                mock_imports,
+            )
+
+    # documenters pass their own bound get_attr, so key by the function
+    getter = getattr(attrgetter, "__func__", attrgetter)
+    key = (
+        modname,
+        tuple(objpath),
+        objtype,
+        getter,
+        warningiserror,
+        macro,
+        tag,
+        static,
+        mock_imports,
+    )
+    return object_cache.lookup(key, compute, (ImportError,))
+
+
+def _import_object(
+    modname: str,
+    objpath: List[str],
+    objtype: str = "",
+    attrgetter: Callable[[Any, str], Any] = safe_getattr,
+    warningiserror: bool = False,
+    macro: bool = False,
+    tag: bool = False,
+    static: bool = False,
+    mock_imports: Tuple[str, ...] = (),
 ) -> Any:
     if objpath:
         logger.debug("[autodoc] from %s import %s", modname, ".".join(objpath))
@@ -165,7 +404,7 @@ def import_object(
         objpath = list(objpath)
         while module is None:
             try:
-                module = import_module(modname, warningiserror=warningiserror)
+                module = _import_module(modname, warningiserror, static, mock_imports)
                 logger.debug("[autodoc] import %s => %r", modname, module)
             except ImportError as exc:
                 logger.debug("[autodoc] import %s => failed", modname)
@@ -182,7 +421,7 @@ def import_object(
         object_name = None
         if macro or tag:
             attrname = objpath[0]
-            mangled_name = hy.mangle(attrname) if not tag else attrname
+            mangled_name = mangle(attrname) if not tag else attrname
             obj = getattr(obj, "__dict__", {}).get(
                 "_hy_reader_macros" if tag else "_hy_macros", {}
             )[mangled_name]
@@ -193,8 +432,8 @@ def import_object(
             for attrname in objpath:
                 parent = obj
                 logger.debug("[autodoc] getattr(_, %r)", attrname)
-                # mangled_name = hy.mangle(obj, attrname)
-                mangled_name = hy.mangle(attrname)
+                # mangled_name = mangle(obj, attrname)
+                mangled_name = mangle(attrname)
                 obj = attrgetter(obj, mangled_name)
                 logger.debug("[autodoc] => %r", obj)
                 object_name = attrname
@@ -235,8 +474,24 @@ def import_object(
         raise ImportError(errmsg) from exc
 
 
+# id(annotation) -> (annotation, string).  Annotations are looked up by
+# identity, as equal typing constructs may render differently (Union[int,
+# str] == Union[str, int]) and some are unhashable; holding the annotation
+# keeps its id from being reused while the entry is cached.
+annotation_strings = build_cache("stringify", maxsize=4096)
+
+
 def stringify(annotation: Any) -> str:
     """Stringify type annotation object."""
+    cached = annotation_strings.get(id(annotation))
+    if cached is not None and cached[0] is annotation:
+        return cached[1]
+    string = _stringify(annotation)
+    annotation_strings.set(id(annotation), (annotation, string))
+    return string
+
+
+def _stringify(annotation: Any) -> str:
     # from sphinx.util import inspect  # lazy loading
 
     if isinstance(annotation, str):
@@ -290,36 +545,106 @@ def _stringify_py37(annotation: Any) -> str:
         if not isinstance(annotation.__args__, (list, tuple)):
             # broken __args__ found
             pass
-        elif qualname == "Union":
+        elif qualname in ("Union", "Optional"):
             if len(annotation.__args__) > 1 and annotation.__args__[-1] is NoneType:
                 if len(annotation.__args__) > 2:
                     args = " ".join(stringify(a) for a in annotation.__args__[:-1])
-                    return f"(get Optional (get Union (, {args})))"
+                    return f"(get Optional (get Union #({args})))"
                 else:
                     return "(get Optional %s)" % stringify(annotation.__args__[0])
             else:
                 args = " ".join(stringify(a) for a in annotation.__args__)
-                return "(get Union (, %s))" % args
+                return "(get Union #(%s))" % args
         elif qualname == "Callable":
-            args = ", ".join(stringify(a) for a in annotation.__args__[:-1])
+            args = " ".join(stringify(a) for a in annotation.__args__[:-1])
             returns = stringify(annotation.__args__[-1])
-            return f"(get {qualname} (, [{args}] {returns}))"
+            return f"(get {qualname} #([{args}] {returns}))"
         elif str(annotation).startswith("typing.Annotated"):  # for py39+
             return stringify(annotation.__args__[0])
         elif all(is_system_TypeVar(a) for a in annotation.__args__):
             # Suppress arguments if all system defined TypeVars (ex. Dict[KT, VT])
             return qualname
+        elif len(annotation.__args__) == 1:
+            return f"(get {qualname} {stringify(annotation.__args__[0])})"
         else:
             args = " ".join(stringify(a) for a in annotation.__args__)
-            return f"(get {qualname} (, {args}))"
+            return f"(get {qualname} #({args}))"
 
     return qualname
 
 
-def signature(obj, bound_method=False, macro=False):
+class HyParameter(NamedTuple):
+    """A parameter as rendered in a Hy signature, passed from the documenters
+    to the domain directives so they don't have to re-parse the signature."""
+
+    name: str
+    kind: Any
+    default: Optional[str]
+    annotation: Optional[str]  # Hy source
+
+
+_NO_DEFAULT = object()
+
+_SECTION_KINDS = {
+    None: Parameter.POSITIONAL_OR_KEYWORD,
+    "#*": Parameter.VAR_POSITIONAL,
+    "*": Parameter.KEYWORD_ONLY,
+    "#**": Parameter.VAR_KEYWORD,
+}
+
+
+# The parameters Hy adds to macros and reader macros
+_HIDDEN_PARAMETERS = frozenset(map(mangle, ("&compiler", "&reader", "&key")))
+
+# (code object, bound_method, macro) -> (function, signature): entries are
+# shared by the functions compiled from the same code, such as inherited
+# methods and re-exported functions, as long as they have the same defaults
+# and annotations.  Callables without code of their own are keys themselves.
+arglist_cache = build_cache("arglists", maxsize=16384)
+
+
+def _signature_target(obj: Any) -> Any:
+    """Unwrap *obj* the way its signature is computed: through
+    ``functools.wraps`` chains, and from methods to their function."""
+    obj = unwrap(obj, stop=lambda f: hasattr(f, "__signature__"))
+    return getattr(obj, "__func__", obj)
+
+
+def structured_signature(obj, bound_method=False, macro=False):
+    """Return the return annotation, the rendered arglist and the tuple of
+    :class:`HyParameter` of *obj*."""
+    obj = _signature_target(obj)
+    if not isinstance(obj, types.FunctionType) or hasattr(obj, "__signature__"):
+        try:
+            return arglist_cache.lookup(
+                (obj, bound_method, macro),
+                lambda: _structured_signature(obj, bound_method, macro),
+                (TypeError, ValueError),
+            )
+        except TypeError:
+            if isinstance(obj, Hashable):
+                raise
+            return _structured_signature(obj, bound_method, macro)
+
+    key = (obj.__code__, bound_method, macro)
+    cached = arglist_cache.get(key)
+    if cached is not None:
+        function, result = cached
+        if (
+            function.__defaults__ is obj.__defaults__
+            and function.__kwdefaults__ is obj.__kwdefaults__
+            and function.__annotations__ is obj.__annotations__
+        ):
+            return result
+    result = _structured_signature(obj, bound_method, macro)
+    arglist_cache.set(key, (obj, result))
+    return result
+
+
+def _structured_signature(obj, bound_method=False, macro=False):
     argspec = getfullargspec(obj)
     args = [
-        (arg,)
+        (arg, _NO_DEFAULT)
         for arg in argspec.args[: len(argspec.args) - (len(argspec.defaults or []))]
     ]
     defaults = list(islice(argspec.args, len(args or []), None))
@@ -327,18 +652,18 @@ def signature(obj, bound_method=False, macro=False):
 
     if bound_method and args and args[0][0] == "self":
         args.pop(0)
-    while args and args[0][0] in map(hy.mangle, ("&compiler", "&reader", "&key")):
+    while args and args[0][0] in _HIDDEN_PARAMETERS:
         args.pop(0)
     kwonlydefaults = argspec.kwonlydefaults.items() if argspec.kwonlydefaults else []
     kwonly = [
-        arg
+        (arg, _NO_DEFAULT)
         for arg in (argspec.kwonlyargs or [])
         if arg not in (argspec.kwonlydefaults or {})
     ]
-    kwargs = [*map(tuple, kwonly), *kwonlydefaults]
+    kwargs = [*kwonly, *kwonlydefaults]
 
-    varargs = [[argspec.varargs]] if argspec.varargs else []
-    varkwargs = [[argspec.varkw]] if argspec.varkw else []
+    varargs = [(argspec.varargs, _NO_DEFAULT)] if argspec.varargs else []
+    varkwargs = [(argspec.varkw, _NO_DEFAULT)] if argspec.varkw else []
 
     sections = [
         [args, None],
@@ -347,21 +672,23 @@ def signature(obj, bound_method=False, macro=False):
         [kwargs, "*"],
         [varkwargs, "#**"],
     ]
+    annotations = {
+        arg: stringify(ann)
+        for arg, ann in argspec.annotations.items()
+        if ann is not None and arg != "return"
+    }
 
-    def render_arg(arg, default=None):
-        ann = argspec.annotations.get(arg)
-        ann = f"^{stringify(ann)}" if ann is not None else ""
-        arg = hy.unmangle(str(arg))
-        return (
-            (f"{ann} {arg}" if ann else arg)
-            if default is None
-            else f"{ann} [{arg} {default}]"
-        )
+    def render_arg(arg, default=_NO_DEFAULT):
+        ann = annotations.get(arg)
+        ann = f"^{ann}" if ann is not None else ""
+        arg = unmangle(str(arg))
+        arg = arg if default is _NO_DEFAULT else f"[{arg} {default}]"
+        return f"{ann} {arg}" if ann else arg
 
     def render_vararg(arg, opener):
-        ann = argspec.annotations.get(arg)
-        ann = f"^{stringify(ann)}" if ann is not None else ""
-        arg = hy.unmangle(str(arg))
+        ann = annotations.get(arg)
+        ann = f"^{ann}" if ann is not None else ""
+        arg = unmangle(str(arg))
         return f"{ann} {opener} {arg}" if ann else f"{opener} {arg}"
 
     def format_section(args, opener):
@@ -372,64 +699,337 @@ def signature(obj, bound_method=False, macro=False):
             return render_vararg(args[0][0], opener)
         else:
             args = list(starmap(render_arg, args))
+            if opener == "*" and varargs:
+                # keyword-only arguments already follow #* varargs
+                opener = None
             opener = f"{opener} " if opener else ""
             return opener + " ".join(args)
 
     arg_string = " ".join(
         filter(None, (format_section(args, opener) for args, opener in sections))
     )
+    parameters = tuple(
+        HyParameter(
+            arg,
+            _SECTION_KINDS[opener],
+            None if default is _NO_DEFAULT else str(default),
+            annotations.get(arg),
+        )
+        for args, opener in sections
+        for arg, default in args
+    )
 
     retann = argspec.annotations.get("return")
     retann = stringify(retann) if retann else ""
-    return f"^{retann}" if retann else None, f"[{arg_string}]"
+    return f"^{retann}" if retann else None, f"[{arg_string}]", parameters
 
 
-def get_module_members(module: Any):
-    """Get members of target module."""
-    from sphinx.ext.autodoc import INSTANCEATTR
+def signature(obj, bound_method=False, macro=False):
+    retann, arg_string, parameters = structured_signature(obj, bound_method, macro)
+    return retann, arg_string
+
+
+# Macros are classified here when a module's members are enumerated, rather
+# than by setting attributes on the macro functions
+_macros = weakref.WeakSet()  # type: weakref.WeakSet
+_reader_macros = weakref.WeakSet()  # type: weakref.WeakSet
+
+
+def is_macro(obj: Any) -> bool:
+    try:
+        return obj in _macros
+    except TypeError:
+        return False
+
+
+def is_reader_macro(obj: Any) -> bool:
+    try:
+        return obj in _reader_macros
+    except TypeError:
+        return False
+
+
+class ModuleSnapshot(NamedTuple):
+    """The members of a module, enumerated once per build."""
+
+    members: Tuple[Tuple[str, Any], ...]  # sorted (unmangled name, value)
+    attributes: Mapping[str, Any]  # mangled name -> value, in dir() order
+    macros: Mapping[str, Any]  # mangled name -> macro
+    reader_macros: Mapping[str, Any]  # name -> reader macro
+    annotations: Mapping[str, Any]
 
+
+# module name -> (module, ModuleSnapshot)
+member_cache = build_cache("members", maxsize=1024)
+
+
+def _take_snapshot(module: Any) -> ModuleSnapshot:
     members = {}
-    macros = safe_getattr(module, "_hy_macros", {})
+    attributes = {}
+    macros = dict(safe_getattr(module, "_hy_macros", None) or {})
+    reader_macros = dict(safe_getattr(module, "_hy_reader_macros", None) or {})
     is_core_module = "hy.core" in module.__name__
 
     for name in dir(module):
         try:
             value = safe_getattr(module, name, None)
-            name = hy.unmangle(name)
-            members[name] = (name, value)
+            attributes[name] = value
+            members[unmangle(name)] = (unmangle(name), value)
         except AttributeError:
             continue
 
+    for table, classified in ((macros, _macros), (reader_macros, _reader_macros)):
+        for value in table.values():
+            try:
+                classified.add(value)
+            except TypeError:
+                continue
+
     for name, value in macros.items():
+        if name not in builtins._hy_macros or is_core_module:
+            members[unmangle(name)] = (unmangle(name), value)
+
+    try:
+        annotations = dict(getannotations(module))
+    except AttributeError:
+        annotations = {}
+
+    return ModuleSnapshot(
+        tuple(sorted(members.values(), key=lambda member: member[0])),
+        types.MappingProxyType(attributes),
+        types.MappingProxyType(macros),
+        types.MappingProxyType(reader_macros),
+        types.MappingProxyType(annotations),
+    )
+
+
+def module_snapshot(module: Any) -> ModuleSnapshot:
+    """Return the build's snapshot of the members of *module*."""
+    name = safe_getattr(module, "__name__", None)
+    cached = member_cache.get(name) if isinstance(name, str) else None
+    if cached is None or cached[0] is not module:
+        cached = (module, _take_snapshot(module))
+        if isinstance(name, str):
+            member_cache.set(name, cached)
+    return cached[1]
+
+
+def get_module_members(module: Any):
+    """Get members of target module."""
+    return list(module_snapshot(module).members)
+
+
+def hy_source_files(module: Any) -> Set[str]:
+    """Return the ``.hy`` files *module* is compiled from: its own source and
+    those of the modules its macros and reader macros were required from."""
+    modules = {module}
+    for macros in (
+        getattr(module, "_hy_macros", None) or {},
+        getattr(module, "_hy_reader_macros", None) or {},
+    ):
+        for macro in macros.values():
+            modname = getattr(macro, "__module__", None)
+            if isinstance(modname, str):
+                modules.add(sys.modules.get(modname))
+
+    files = set()
+    for mod in modules:
+        filename = getattr(mod, "__file__", None)
+        if isinstance(filename, str) and filename.endswith(".hy"):
+            files.add(filename)
+    return files
+
+
+# ** Import failures
+# A failed import is recorded in the environment with the digests of the
+# sources involved and the names of the modules that could not be found.
+# While those are unchanged the failure is replayed instead of importing
+# again, and the documents it happened in are not reread.
+
+
+def _install_paths(*names: str) -> Tuple[str, ...]:
+    paths = sysconfig.get_paths()
+    return tuple({os.path.normpath(paths[name]) + os.sep for name in names})
+
+
+_STDLIB_PATHS = _install_paths("stdlib", "platstdlib")
+# installed packages can be upgraded, so their sources are recorded, even
+# though site-packages usually lies inside the standard library directory
+_SITE_PATHS = _install_paths("purelib", "platlib")
+
+
+def _is_stdlib_file(filename: str) -> bool:
+    return filename.startswith(_STDLIB_PATHS) and not filename.startswith(_SITE_PATHS)
+
+
+class ImportFailure(NamedTuple):
+    message: str
+    sources: Dict[str, Optional[str]]  # filename -> digest
+    missing: Tuple[str, ...]  # top-level modules that could not be found
+
+    def is_current(self) -> bool:
+        """Whether importing again would fail the same way."""
+        if any(file_digest(fn) != digest for fn, digest in self.sources.items()):
+            return False
+        for modname in self.missing:
+            try:
+                if importlib.util.find_spec(modname) is not None:
+                    return False
+            except (ImportError, ValueError):
+                pass
+        return True
+
+
+def _module_files(modname: str) -> List[str]:
+    """Locate the sources of *modname* and its parent packages without
+    executing them."""
+    files = []
+    path = None
+    parts = modname.split(".")
+    for i in range(len(parts)):
         try:
-            setattr(value, "_hy_macro", True)
-            if name not in builtins._hy_macros or is_core_module:
-                name = hy.unmangle(name)
-                members[name] = (name, value)
-        except AttributeError:
+            spec = importlib.machinery.PathFinder.find_spec(
+                ".".join(parts[: i + 1]), path
+            )
+        except (ImportError, ValueError):
+            spec = None
+        if spec is None:
+            break
+        if spec.has_location and spec.origin:
+            files.append(spec.origin)
+        path = spec.submodule_search_locations
+        if path is None:
+            break
+    return files
+
+
+def import_failure(modname: str, exc: BaseException) -> ImportFailure:
+    """Describe the failure *exc* to import *modname*."""
+    message = str(exc.args[0]) if exc.args else str(exc)
+    sources = set(_module_files(modname))
+    missing = set()
+    seen = set()
+    excs = [exc]  # type: List[Optional[BaseException]]
+    while excs:
+        cause = excs.pop()
+        if cause is None or id(cause) in seen:
             continue
+        seen.add(id(cause))
+        if isinstance(cause, ModuleNotFoundError) and cause.name:
+            missing.add(cause.name.partition(".")[0])
+        for frame, lineno in traceback.walk_tb(cause.__traceback__):
+            filename = os.path.normpath(frame.f_code.co_filename)
+            if os.path.isfile(filename) and not _is_stdlib_file(filename):
+                sources.add(filename)
+        # autodoc's ImportError carries the original exception as argument
+        excs.extend(arg for arg in cause.args if isinstance(arg, BaseException))
+        excs.extend((cause.__cause__, cause.__context__))
+
+    return ImportFailure(
+        message,
+        {filename: file_digest(filename) for filename in sorted(sources)},
+        tuple(sorted(missing)),
+    )
 
-    ret = sorted(list(members.values()))
 
-    # annotation only member (ex. attr: int)
-    try:
-        for name in getannotations(module):
-            if name not in members:
-                members[name] = (name, INSTANCEATTR)
-    except AttributeError:
-        pass
+def recorded_import_failure(env, key: tuple) -> Optional[ImportFailure]:
+    """Return the recorded failure for *key* if it is still current."""
+    failure = getattr(env, "hy_import_failures", {}).get(key)
+    if failure is not None and failure.is_current():
+        return failure
+    return None
 
-    return ret
+
+def note_import_failure(
+    env, key: tuple, failure: ImportFailure, docname: Optional[str] = None
+) -> None:
+    """Record that importing *key* failed in *docname*, by default the
+    current document."""
+    if not hasattr(env, "hy_import_failures"):
+        env.hy_import_failures = {}  # key -> ImportFailure
+        env.hy_import_failure_docs = {}  # docname -> {key}
+    env.hy_import_failures[key] = failure
+    env.hy_import_failure_docs.setdefault(docname or env.docname, set()).add(key)
 
 
 def is_hy(member, membername, parent):
-    return type(parent) in {
-        HyDocumenter,
-        HyModuleDocumenter,
-        HyFunctionDocumenter,
-        HyMethodDocumenter,
-        HyClassDocumenter,
-    }
+    return type(parent) in _hy_parents
+
+
+# Modules whose documenters only look at what _member_kind() captures
+_INDEXABLE_MODULES = frozenset({"sphinx.ext.autodoc", __name__})
+
+# (documenters, member kind) -> documenter class or None
+dispatch_cache = build_cache("dispatch", maxsize=4096)
+
+
+def _member_kind(
+    member: Any, membername: str, isattr: bool, parent: Any
+) -> Optional[tuple]:
+    """Classify *member* by everything the ``can_document_member`` predicates
+    of the known documenters depend on, or return None if it cannot be."""
+    # autodoc's PropertyDocumenter also looks up the member in the class
+    # __dict__, for properties wrapped in classmethod
+    namespace = safe_getattr(safe_getattr(parent, "object", None), "__dict__", None)
+    if isinstance(namespace, Mapping) and isinstance(
+        namespace.get(membername), (classmethod, staticmethod)
+    ):
+        return None
+    unwrapped = inspect.unwrap_all(member)
+    for obj in (member, unwrapped):
+        wrapped = safe_getattr(obj, "__wrapped__", None)
+        if wrapped is not None and not inspect.isroutine(obj):
+            # inspect.isattributedescriptor() unwraps these further
+            return None
+    return (
+        type(member),
+        type(unwrapped),
+        isinstance(member, type) and issubclass(member, BaseException),
+        inspect.isNewType(member),
+        is_macro(member),
+        is_reader_macro(member),
+        isattr,
+        type(parent),
+    )
+
+
+def _scan_documenters(
+    documenters: Tuple[type, ...], member: Any, membername: str, isattr: bool, parent
+) -> Optional[type]:
+    classes = [
+        cls
+        for cls in documenters
+        if cls.can_document_member(member, membername, isattr, parent)
+    ]
+    if not classes:
+        # don't know how to document this member
+        return None
+    # prefer the documenter with the highest priority
+    classes.sort(key=lambda cls: cls.priority)
+    return classes[-1]
+
+
+def find_documenter(
+    documenters: Tuple[type, ...], member: Any, membername: str, isattr: bool, parent
+) -> Optional[type]:
+    """Return the documenter of the highest priority among *documenters* that
+    can document *member*, or None.
+
+    When all of *documenters* are the Hy or the autodoc ones, the answer only
+    depends on the kind of the member, and is looked up per kind.
+    """
+    if all(cls.__module__ in _INDEXABLE_MODULES for cls in documenters):
+        kind = _member_kind(member, membername, isattr, parent)
+        if kind is not None:
+            key = (documenters, kind)
+            doccls = dispatch_cache.get(key, MISSING)
+            if doccls is MISSING:
+                doccls = _scan_documenters(
+                    documenters, member, membername, isattr, parent
+                )
+                dispatch_cache.set(key, doccls)
+            return doccls
+    return _scan_documenters(documenters, member, membername, isattr, parent)
 
 
 class HyAutodocDirective(AutodocDirective):
@@ -487,9 +1087,12 @@ class HyAutodocDirective(AutodocDirective):
         logger.debug("[autodoc] output:\n%s", "\n".join(params.result))
 
         # record all filenames as dependencies -- this will at least
-        # partially make automatic invalidation possible
-        for fn in params.filename_set:
-            self.state.document.settings.record_dependencies.add(fn)
+        # partially make automatic invalidation possible.  They are noted in
+        # the environment rather than the document settings, whose list is
+        # shared by all the documents of a process before Sphinx 5.1.
+        frompath = os.path.join(os.path.normpath(self.env.srcdir), "dummy")
+        for fn in params.record_dependencies:
+            self.env.note_dependency(relative_path(frompath, os.path.abspath(fn)))
 
         result = parse_generated_content(self.state, params.result, documenter)
         return result
@@ -527,38 +1130,72 @@ class HyDocumenter(PyDocumenter):
 
         return True
 
+    # extra arguments to import_object
+    import_options = {}  # type: Dict[str, bool]
+
     def import_object(self, raiseerror: bool = False) -> bool:
         """Import the object given by *self.modname* and *self.objpath* and set
         it as *self.object*.
         Returns True if successful, False if an error occurred.
         """
-        with mock(self.env.config.autodoc_mock_imports):
+        mock_imports = self.config.autodoc_mock_imports
+        key = (self.modname, tuple(self.objpath), self.objtype, tuple(mock_imports))
+        if not raiseerror:
+            failure = recorded_import_failure(self.env, key)
+            if failure is not None:
+                logger.warning(failure.message)
+                note_import_failure(self.env, key, failure)
+                return False
+
+        with mock(mock_imports):
             try:
                 ret = import_object(
                     self.modname,
                     self.objpath,
                     self.objtype,
                     attrgetter=self.get_attr,
-                    warningiserror=self.env.config.autodoc_warningiserror,
+                    warningiserror=self.config.autodoc_warningiserror,
+                    static=self.config.hy_static_analysis,
+                    mock_imports=mock_imports,
+                    **self.import_options,
                 )
                 self.module, self.parent, self.object_name, self.object = ret
+                self.record_hy_dependencies()
+                for modname in {self.modname, self.get_real_modname()}:
+                    if isinstance(modname, str):
+                        prime_module_analyzer(modname)
                 return True
             except ImportError as exc:
                 if raiseerror:
                     raise
                 else:
                     logger.warning(exc.args[0])
-                    self.env.note_reread()
+                    note_import_failure(
+                        self.env, key, import_failure(self.modname, exc)
+                    )
                     return False
 
+    def record_hy_dependencies(self) -> None:
+        """Make the document depend on the Hy sources of the imported module
+        and of the module defining the object, which the Python module
+        analyzer does not know about."""
+        modules = {self.module, sys.modules.get(self.modname)}
+        objmodule = getattr(self.object, "__module__", None)
+        if isinstance(objmodule, str):
+            modules.add(sys.modules.get(objmodule))
+        for module in modules:
+            if module is not None:
+                self.directive.record_dependencies.update(hy_source_files(module))
+
     def format_signature(self, **kwargs: Any) -> str:
         if type(self.object) is types.ModuleType:
             return ""
 
         args = ""
         retann = ""
+        parameters = None
         try:
-            retann, args = signature(
+            retann, args, parameters = structured_signature(
                 self.object,
                 bound_method=isinstance(self, (HyMethodDocumenter, HyClassDocumenter)),
                 macro=isinstance(self, HyMacroDocumenter),
@@ -572,13 +1209,33 @@ class HyDocumenter(PyDocumenter):
             args = None
 
         self.retann = retann
+        self.parameters = parameters
         if args is not None:
             return f" {args}"
         else:
             return ""
 
     def format_name(self) -> str:
-        return hy.unmangle(".".join(self.objpath) or self.modname)
+        return unmangle(".".join(self.objpath) or self.modname)
+
+    def add_variable_options(self) -> None:
+        """Add the type the module analyzer found for a variable or an
+        attribute, and its value."""
+        sourcename = self.get_sourcename()
+        key = (".".join(self.objpath[:-1]), self.objpath[-1])
+        try:
+            annotations = ModuleAnalyzer.for_module(self.real_modname).annotations
+        except (AttributeError, PycodeError):
+            annotations = {}
+        if key in annotations:
+            self.add_line("   :type: " + annotations[key], sourcename)
+        if not self.options.no_value and self.object is not INSTANCEATTR:
+            try:
+                self.add_line(
+                    "   :value: " + object_description(self.object), sourcename
+                )
+            except ValueError:
+                pass
 
     def add_directive_header(self, sig: str) -> None:
         """Add the directive header and options to the generated content."""
@@ -587,15 +1244,20 @@ class HyDocumenter(PyDocumenter):
         name = self.format_name()
         sourcename = self.get_sourcename()
 
+        # the domain directive looks up the parameters by signature, rather
+        # than parsing and compiling what we render here
+        parameters = getattr(self, "parameters", None)
+        signatures = self.env.temp_data.setdefault("hy:autodoc_signatures", {})
+
         # one signature per line, indented by column
         prefix = f".. {domain}:{directive}:: "
         for i, sig_line in enumerate(sig.split("\n")):
             if sig:
                 retann = getattr(self, "retann", None)
-                self.add_line(
-                    f"{prefix}({retann + ' ' if retann else ''}{name}{sig_line})",
-                    sourcename,
-                )
+                line = f"({retann + ' ' if retann else ''}{name}{sig_line})"
+                self.add_line(prefix + line, sourcename)
+                if parameters is not None:
+                    signatures[line] = parameters
             else:
                 self.add_line(f"{prefix}{name}{sig_line}", sourcename)
 
@@ -633,21 +1295,15 @@ class HyDocumenter(PyDocumenter):
         # module_macros = [
         #     member for member in members if getattr(member, "_hy_macro", False)
         # ]
+        documenters = tuple(self.documenters.values())
         for mname, member, isattr in wanted_members:
-            classes = [
-                cls
-                for cls in self.documenters.values()
-                if cls.can_document_member(member, mname, isattr, self)
-            ]
-            if not classes:
-                # don't know how to document this member
+            doccls = find_documenter(documenters, member, mname, isattr, self)
+            if doccls is None:
                 continue
-            # prefer the documenter with the highest priority
-            classes.sort(key=lambda cls: cls.priority)
             # give explicitly separated module name, so that members
             # of inner classes can be documented
             full_mname = self.modname + "::" + ".".join(self.objpath + [mname])
-            documenter = classes[-1](self.directive, full_mname, self.indent)
+            documenter = doccls(self.directive, full_mname, self.indent)
             memberdocumenters.append((documenter, isattr))
 
         member_order = self.options.member_order or self.config.autodoc_member_order
@@ -701,9 +1357,25 @@ class HyModuleDocumenter(HyDocumenter, PyModuleDocumenter):
 
         return ret
 
+    def sort_members(self, documenters, order: str):
+        if order == "bysource" and self.__all__:
+            # like Sphinx, but __all__ lists mangled names
+            documenters.sort(key=lambda entry: entry[0].name)
+
+            def keyfunc(entry) -> int:
+                name = mangle(entry[0].name.split("::")[1])
+                if name in self.__all__:
+                    return self.__all__.index(name)
+                return len(self.__all__)
+
+            documenters.sort(key=keyfunc)
+            return documenters
+        return super().sort_members(documenters, order)
+
     def get_object_members(self, want_all: bool):
+        snapshot = module_snapshot(self.object)
         if want_all:
-            members = get_module_members(self.object)
+            members = list(snapshot.members)
             members = [
                 member for member in members if not member[0].startswith("-hy-anon-var")
             ]
@@ -714,10 +1386,8 @@ class HyModuleDocumenter(HyDocumenter, PyModuleDocumenter):
             else:
                 ret = []
                 for name, value in members:
-                    is_macro = getattr(value, "_hy_macro", False)
-
-                    if (hy.mangle(name) in self.__all__) or (
-                        is_macro and self.options.macros
+                    if (mangle(name) in self.__all__) or (
+                        is_macro(value) and self.options.macros
                     ):
                         ret.append(ObjectMember(name, value))
                     else:
@@ -726,12 +1396,12 @@ class HyModuleDocumenter(HyDocumenter, PyModuleDocumenter):
                 return False, ret
         else:
             memberlist = (
-                dir(self.object)
+                list(snapshot.attributes)
                 if self.options.members is ALL
                 else (self.options.members or [])
             )
             memberlist = [
-                hy.unmangle(member)
+                unmangle(member)
                 for member in memberlist
                 if not member.startswith("_hy_anon_var")
                 and not (
@@ -744,7 +1414,11 @@ class HyModuleDocumenter(HyDocumenter, PyModuleDocumenter):
             member_ret = []
             for name in memberlist:
                 try:
-                    value = safe_getattr(self.object, hy.mangle(name))
+                    mangled = mangle(name)
+                    if mangled in snapshot.attributes:
+                        value = snapshot.attributes[mangled]
+                    else:
+                        value = safe_getattr(self.object, mangled)
                     member_ret.append(ObjectMember(name, value))
                 except AttributeError:
                     logger.warning(
@@ -756,26 +1430,20 @@ class HyModuleDocumenter(HyDocumenter, PyModuleDocumenter):
                         # type="autodoc",
                     )
             macro_ret = []
-            for option, module_attr in (
-                ("macros", "_hy_macros"),
-                ("readers", "_hy_reader_macros"),
+            for option, macros in (
+                ("macros", snapshot.macros),
+                ("readers", snapshot.reader_macros),
             ):
                 macromembers = (
-                    safe_getattr(self.object, module_attr, {}).keys()
+                    macros.keys()
                     if getattr(self.options, option) is ALL
                     else getattr(self.options, option) or []
                 )
-                macros = safe_getattr(self.object, module_attr, {})
                 for name in macromembers:
                     macro_obj = macros.get(
-                        hy.mangle(name) if option != "readers" else name
+                        mangle(name) if option != "readers" else name
                     )
                     if macro_obj:
-                        setattr(
-                            macro_obj,
-                            "_hy_reader_macro" if option == "readers" else "_hy_macro",
-                            True,
-                        )
                         macro_ret.append(ObjectMember(name, macro_obj))
                     else:
                         logger.warning(
@@ -817,74 +1485,26 @@ class HyMacroDocumenter(HyFunctionDocumenter):
     objtype = "macro"
     member_order = 30
     priority = 3  # Above regular function documenter
+    import_options = {"macro": True}
 
     @classmethod
     def can_document_member(cls, member, membername, isattr, parent):
         return super().can_document_member(
             member, membername, isattr, parent
-        ) and getattr(member, "_hy_macro", False)
-
-    def import_object(self, raiseerror: bool = False) -> bool:
-        """Import the object given by *self.modname* and *self.objpath* and set
-        it as *self.object*.
-        Returns True if successful, False if an error occurred.
-        """
-        with mock(self.config.autodoc_mock_imports):
-            try:
-                ret = import_object(
-                    self.modname,
-                    self.objpath,
-                    self.objtype,
-                    attrgetter=self.get_attr,
-                    warningiserror=self.config.autodoc_warningiserror,
-                    macro=True,
-                )
-                self.module, self.parent, self.object_name, self.object = ret
-                return True
-            except ImportError as exc:
-                if raiseerror:
-                    raise
-                else:
-                    logger.warning(exc.args[0])
-                    self.env.note_reread()
-                    return False
+        ) and is_macro(member)
 
 
 class HyTagDocumenter(HyFunctionDocumenter):
     objtype = "tag"
     member_order = 30
     priority = 3  # Above regular function documenter
+    import_options = {"tag": True}
 
     @classmethod
     def can_document_member(cls, member, membername, isattr, parent):
         return super().can_document_member(
             member, membername, isattr, parent
-        ) and getattr(member, "_hy_reader_macro", False)
-
-    def import_object(self, raiseerror: bool = False) -> bool:
-        """Import the object given by *self.modname* and *self.objpath* and set
-        it as *self.object*.
-        Returns True if successful, False if an error occurred.
-        """
-        with mock(self.config.autodoc_mock_imports):
-            try:
-                ret = import_object(
-                    self.modname,
-                    self.objpath,
-                    self.objtype,
-                    attrgetter=self.get_attr,
-                    warningiserror=self.config.autodoc_warningiserror,
-                    tag=True,
-                )
-                self.module, self.parent, self.object_name, self.object = ret
-                return True
-            except ImportError as exc:
-                if raiseerror:
-                    raise
-                else:
-                    logger.warning(exc.args[0])
-                    self.env.note_reread()
-                    return False
+        ) and is_reader_macro(member)
 
 
 class HyMethodDocumenter(HyDocumenter, PyMethodDocumenter):
@@ -1004,3 +1624,105 @@ class HyExceptionDocumenter(HyClassDocumenter):
             and isinstance(member, type)
             and issubclass(member, BaseException)
         )
+
+
+class HyDataDocumenter(HyDocumenter, PyDataDocumenter):
+    """
+    Specialized Documenter subclass for the variables of a module that the
+    module analyzer found documentation comments for.
+    """
+
+    objtype = "data"
+    priority = PyDataDocumenter.priority + 1
+
+    @classmethod
+    def can_document_member(
+        cls, member: Any, membername: str, isattr: bool, parent: Any
+    ) -> bool:
+        return (
+            is_hy(member, membername, parent)
+            and isattr
+            and isinstance(parent, HyModuleDocumenter)
+        )
+
+    def format_signature(self, **kwargs: Any) -> str:
+        return ""
+
+    def add_directive_header(self, sig: str) -> None:
+        super().add_directive_header(sig)
+        self.add_variable_options()
+
+
+class HyAttributeDocumenter(HyDocumenter, PyAttributeDocumenter):
+    """
+    Specialized Documenter subclass for the attributes of a class that the
+    module analyzer found documentation comments for, including those only
+    set on instances.
+    """
+
+    objtype = "attribute"
+    priority = PyAttributeDocumenter.priority + 1
+
+    @classmethod
+    def can_document_member(
+        cls, member: Any, membername: str, isattr: bool, parent: Any
+    ) -> bool:
+        return (
+            is_hy(member, membername, parent)
+            and isattr
+            and isinstance(parent, HyClassDocumenter)
+        )
+
+    def import_object(self, raiseerror: bool = False) -> bool:
+        mock_imports = self.config.autodoc_mock_imports
+        try:
+            with mock(mock_imports):
+                module, _, _, parent = import_object(
+                    self.modname,
+                    self.objpath[:-1],
+                    "class",
+                    attrgetter=self.get_attr,
+                    warningiserror=self.config.autodoc_warningiserror,
+                    static=self.config.hy_static_analysis,
+                    mock_imports=mock_imports,
+                )
+        except ImportError:
+            return super().import_object(raiseerror)
+
+        name = self.objpath[-1]
+        if hasattr(parent, mangle(name)):
+            return super().import_object(raiseerror)
+
+        # an attribute set on instances is only known to the analyzer
+        modname = safe_getattr(parent, "__module__", None)
+        if isinstance(modname, str):
+            prime_module_analyzer(modname)
+            try:
+                attr_docs = ModuleAnalyzer.for_module(modname).find_attr_docs()
+            except PycodeError:
+                attr_docs = {}
+            if (".".join(self.objpath[:-1]), name) in attr_docs:
+                self.module, self.parent = module, parent
+                self.object_name, self.object = name, INSTANCEATTR
+                self.record_hy_dependencies()
+                return True
+        return super().import_object(raiseerror)
+
+    def format_signature(self, **kwargs: Any) -> str:
+        return ""
+
+    def add_directive_header(self, sig: str) -> None:
+        super().add_directive_header(sig)
+        self.add_variable_options()
+
+
+# The parents whose members is_hy() accepts
+_hy_parents = frozenset(
+    {
+        HyDocumenter,
+        HyModuleDocumenter,
+        HyFunctionDocumenter,
+        HyMethodDocumenter,
+        HyClassDocumenter,
+    }
+)
@@ -0,0 +1,550 @@
+"""
+    sphinxcontrib.hy_source
+    ~~~~~~~~~~~~~~~~~~~~~~~
+    Static analysis of Hy sources.
+
+    :func:`read_module` reads a ``.hy`` file with the Hy reader and builds a
+    stand-in module from its top-level definitions without executing any of
+    it.  Functions, macros and reader macros are replaced by stubs carrying
+    the signature, annotations and docstring found in the source, classes by
+    classes of such stubs.  Default values and annotations that are not
+    literals are kept as their Hy source.
+
+    Sources containing any other top-level form raise :class:`Unsupported`,
+    as the names they define can only be known by running them.
+
+    :class:`HyModuleAnalyzer` stands in for Sphinx's Python-only module
+    analyzer: it finds the order and location of definitions and the
+    documentation of attributes in a Hy source.
+"""
+
+import builtins
+import inspect
+import re
+import types
+from collections import OrderedDict
+from inspect import Parameter
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import hy
+from hy.models import Bytes, Complex
+from hy.models import Dict as HyDict
+from hy.models import Expression, Float, Integer, Keyword
+from hy.models import List as HyList
+from hy.models import Object
+from hy.models import Set as HySet
+from hy.models import String, Symbol
+from hy.models import Tuple as HyTuple
+from sphinx.errors import PycodeError
+from sphinx.pycode import ModuleAnalyzer
+
+from sphinxcontrib.hy_cache import mangle, unmangle
+
+
+class Unsupported(Exception):
+    """The source uses a construct that can't be documented statically."""
+
+
+class SourceValue:
+    """A value that is not a literal, shown as its Hy source."""
+
+    __slots__ = ("source",)
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def __repr__(self) -> str:
+        return self.source
+
+    __str__ = __repr__
+
+
+class Definition(NamedTuple):
+    """A top-level form that binds a name."""
+
+    kind: str  # "function", "macro", "reader", "class" or "data"
+    name: str  # as written in the source
+    value: Any
+    form: Expression
+
+
+# The forms skipped at the top level: they bind no documented names
+IGNORED_FORMS = frozenset({"import", "require"})
+
+# Decorators with an effect on how methods are documented
+METHOD_DECORATORS = {
+    "staticmethod": staticmethod,
+    "classmethod": classmethod,
+    "property": property,
+}
+
+_LITERAL_SYMBOLS = {"None": None, "True": True, "False": False, "...": Ellipsis}
+
+_READER_PARAMETERS = tuple(
+    Parameter(mangle(name), Parameter.POSITIONAL_OR_KEYWORD)
+    for name in ("&reader", "&key")
+)
+
+
+def _stub(*args, **kwargs):
+    pass
+
+
+async def _async_stub(*args, **kwargs):
+    pass
+
+
+def _head(form: Any) -> Optional[str]:
+    if isinstance(form, Expression) and form and isinstance(form[0], Symbol):
+        return str(form[0])
+    return None
+
+
+def literal(model: Object) -> Any:
+    """Return the value of *model* if it is a literal, else raise ValueError."""
+    if isinstance(model, (String, Keyword)):
+        return str(model) if isinstance(model, String) else model
+    if isinstance(model, Bytes):
+        return bytes(model)
+    if isinstance(model, Integer):
+        return int(model)
+    if isinstance(model, Float):
+        return float(model)
+    if isinstance(model, Complex):
+        return complex(model)
+    if isinstance(model, Symbol) and str(model) in _LITERAL_SYMBOLS:
+        return _LITERAL_SYMBOLS[str(model)]
+    if isinstance(model, HyList):
+        return [literal(item) for item in model]
+    if isinstance(model, HyTuple):
+        return tuple(literal(item) for item in model)
+    if isinstance(model, HySet):
+        return {literal(item) for item in model}
+    if isinstance(model, HyDict):
+        items = [literal(item) for item in model]
+        return dict(zip(items[::2], items[1::2]))
+    raise ValueError(model)
+
+
+class HySource:
+    """The text and top-level forms of a Hy source file."""
+
+    def __init__(self, text: str, filename: str = "<string>"):
+        self.filename = filename
+        self.lines = text.splitlines()
+        try:
+            self.forms = list(hy.read_many(text, filename=filename))
+        except Exception as exc:
+            raise Unsupported(f"cannot read {filename}: {exc}") from exc
+
+    def text(self, model: Object) -> str:
+        """Return the source of *model*, as written."""
+        start, end = getattr(model, "start_line", None), model.end_line
+        if start is None or end is None or end > len(self.lines):
+            return hy.repr(model).lstrip("'")
+        lines = self.lines[start - 1 : end]
+        lines[-1] = lines[-1][: model.end_column]
+        lines[0] = lines[0][model.start_column - 1 :]
+        return "\n".join(lines)
+
+    def value(self, model: Object) -> Any:
+        try:
+            return literal(model)
+        except ValueError:
+            return SourceValue(self.text(model))
+
+    def fail(self, form: Object, reason: str):
+        line = getattr(form, "start_line", "?")
+        raise Unsupported(f"{self.filename}:{line}: {reason}")
+
+    # ** Lambda lists
+
+    def parameters(self, lambda_list: Object) -> Tuple[List[Parameter], Dict]:
+        """Return the parameters and annotations of a lambda list."""
+        if not isinstance(lambda_list, HyList):
+            self.fail(lambda_list, "the lambda list is not a list")
+
+        parameters = []
+        annotations = {}
+        kind = Parameter.POSITIONAL_OR_KEYWORD
+        for item in lambda_list:
+            annotation = None
+            if _head(item) == "annotate" and len(item) == 3:
+                item, annotation = item[1], self.text(item[2])
+
+            default = Parameter.empty
+            if isinstance(item, Symbol) and str(item) == "/":
+                parameters = [
+                    param.replace(kind=Parameter.POSITIONAL_ONLY)
+                    for param in parameters
+                ]
+                continue
+            if isinstance(item, Symbol) and str(item) == "*":
+                kind = Parameter.KEYWORD_ONLY
+                continue
+
+            if _head(item) == "unpack-iterable" and len(item) == 2:
+                item, param_kind = item[1], Parameter.VAR_POSITIONAL
+                kind = Parameter.KEYWORD_ONLY
+            elif _head(item) == "unpack-mapping" and len(item) == 2:
+                item, param_kind = item[1], Parameter.VAR_KEYWORD
+            elif isinstance(item, HyList) and len(item) == 2:
+                item, default = item[0], self.value(item[1])
+                param_kind = kind
+            else:
+                param_kind = kind
+            if not isinstance(item, Symbol):
+                self.fail(lambda_list, f"unsupported parameter {item!r}")
+
+            name = mangle(item)
+            if annotation is not None:
+                annotations[name] = annotation
+            parameters.append(
+                Parameter(
+                    name,
+                    param_kind,
+                    default=default,
+                    annotation=annotations.get(name, Parameter.empty),
+                )
+            )
+
+        return parameters, annotations
+
+    # ** Definitions
+
+    def _docstring(self, body: List[Object], always: bool = False):
+        """Split a docstring off *body*: the first form, if it is a string
+        followed by other forms (or in any case if *always*)."""
+        if body and isinstance(body[0], String) and (always or len(body) > 1):
+            return str(body[0]), body[1:]
+        return None, body
+
+    def function(
+        self,
+        form: Expression,
+        modname: str,
+        qualname_prefix: str = "",
+        reader: bool = False,
+    ) -> Tuple[str, List[str], Any]:
+        """Return the name, decorator names and stub of a ``defn``,
+        ``defmacro`` or ``defreader`` form."""
+        rest = list(form[1:])
+        decorators = []
+        is_async = False
+        if rest and isinstance(rest[0], HyList) and _head(form) == "defn":
+            decorators = [self.text(decorator) for decorator in rest.pop(0)]
+        if rest and isinstance(rest[0], Keyword) and _head(form) == "defn":
+            if rest[0] != Keyword("async"):
+                self.fail(form, f"unsupported option {rest[0]!r}")
+            rest.pop(0)
+            is_async = True
+
+        returns = None
+        if rest and _head(rest[0]) == "annotate" and len(rest[0]) == 3:
+            returns = self.text(rest[0][2])
+            rest[0] = rest[0][1]
+        if not rest or not isinstance(rest[0], Symbol):
+            self.fail(form, "the name is not a symbol")
+        name = str(rest.pop(0))
+
+        if reader:
+            parameters, annotations = list(_READER_PARAMETERS), {}
+        elif rest:
+            parameters, annotations = self.parameters(rest.pop(0))
+        else:
+            self.fail(form, "missing lambda list")
+        if returns is not None:
+            annotations["return"] = returns
+        doc, _ = self._docstring(rest)
+
+        try:
+            signature = inspect.Signature(
+                parameters,
+                return_annotation=annotations.get("return", Parameter.empty),
+            )
+        except (TypeError, ValueError) as exc:
+            self.fail(form, str(exc))
+
+        stub = types.FunctionType(
+            (_async_stub if is_async else _stub).__code__,
+            {"__name__": modname},
+            mangle(name),
+        )
+        stub.__qualname__ = qualname_prefix + mangle(name)
+        stub.__doc__ = doc
+        stub.__signature__ = signature
+        stub.__annotations__ = annotations
+        return name, decorators, stub
+
+    def assignments(self, form: Expression) -> List[Tuple[str, Any]]:
+        """Return the names and values of a ``setv`` form."""
+        args = list(form[1:])
+        if len(args) % 2:
+            self.fail(form, "odd number of arguments to setv")
+        pairs = []
+        for target, value in zip(args[::2], args[1::2]):
+            if _head(target) == "annotate" and len(target) == 3:
+                target = target[1]
+            if not isinstance(target, Symbol):
+                self.fail(form, f"unsupported assignment to {target!r}")
+            pairs.append((str(target), self.value(value)))
+        return pairs
+
+    def defclass(self, form: Expression, modname: str, namespace: Dict) -> Tuple:
+        rest = list(form[1:])
+        if rest and isinstance(rest[0], HyList):
+            # class decorators may replace the class
+            self.fail(form, "decorated class")
+        if not rest or not isinstance(rest[0], Symbol):
+            self.fail(form, "the class name is not a symbol")
+        name = str(rest.pop(0))
+        mangled = mangle(name)
+
+        bases = []
+        if rest and isinstance(rest[0], HyList):
+            for base in rest.pop(0):
+                if isinstance(base, Symbol):
+                    base = namespace.get(
+                        mangle(base), getattr(builtins, mangle(base), None)
+                    )
+                if not isinstance(base, type):
+                    self.fail(form, "a base class is not defined in the module")
+                bases.append(base)
+
+        doc, body = self._docstring(rest, always=True)
+        attributes = {"__module__": modname, "__qualname__": mangled, "__doc__": doc}
+        for item in body:
+            head = _head(item)
+            if head == "defn":
+                method_name, decorators, method = self.function(
+                    item, modname, mangled + "."
+                )
+                if any("." in decorator for decorator in decorators):
+                    # a property setter or deleter
+                    continue
+                for decorator in reversed(decorators):
+                    if decorator in METHOD_DECORATORS:
+                        method = METHOD_DECORATORS[decorator](method)
+                attributes[mangle(method_name)] = method
+            elif head == "setv":
+                for attrname, value in self.assignments(item):
+                    attributes[mangle(attrname)] = value
+            elif isinstance(item, String):
+                # the docstring of an attribute
+                continue
+            else:
+                self.fail(item, f"unsupported form in class {name}")
+
+        try:
+            return name, type(mangled, tuple(bases) or (object,), attributes)
+        except TypeError as exc:
+            self.fail(form, str(exc))
+
+    def definitions(self, modname: str) -> Tuple[Optional[str], List[Definition]]:
+        """Return the module docstring and the top-level definitions."""
+        forms = list(self.forms)
+        doc = None
+        if forms and isinstance(forms[0], String):
+            doc = str(forms.pop(0))
+
+        namespace = {}
+        definitions = []
+        for form in forms:
+            head = _head(form)
+            if head in IGNORED_FORMS or isinstance(form, String):
+                continue
+            elif head in ("defn", "defmacro", "defreader"):
+                kind = {"defn": "function", "defmacro": "macro"}.get(head, "reader")
+                name, decorators, stub = self.function(
+                    form, modname, reader=head == "defreader"
+                )
+                if decorators:
+                    self.fail(form, "decorated function")
+                definitions.append(Definition(kind, name, stub, form))
+            elif head == "defclass":
+                name, cls = self.defclass(form, modname, namespace)
+                definitions.append(Definition("class", name, cls, form))
+                namespace[mangle(name)] = cls
+            elif head == "setv":
+                for name, value in self.assignments(form):
+                    definitions.append(Definition("data", name, value, form))
+                    namespace[mangle(name)] = value
+            else:
+                self.fail(form, f"unsupported top-level form {head or form!r}")
+
+        return doc, definitions
+
+
+def read_module(filename: str, modname: str) -> types.ModuleType:
+    """Return a stand-in for the module *modname* defined in the Hy source
+    *filename*.  Raises :class:`Unsupported` if it cannot be read statically."""
+    try:
+        with open(filename, encoding="utf-8") as f:
+            source = HySource(f.read(), filename)
+    except OSError as exc:
+        raise Unsupported(f"cannot read {filename}: {exc}") from exc
+
+    doc, definitions = source.definitions(modname)
+    module = types.ModuleType(modname, doc)
+    module.__file__ = filename
+    module._hy_macros = {}
+    module._hy_reader_macros = {}
+    for definition in definitions:
+        if definition.kind == "macro":
+            module._hy_macros[mangle(definition.name)] = definition.value
+        elif definition.kind == "reader":
+            module._hy_reader_macros[definition.name] = definition.value
+        else:
+            setattr(module, mangle(definition.name), definition.value)
+    return module
+
+
+# ** Module analyzer
+
+# Attribute documentation comments: ";; #: text", before or after a setv
+_DOC_COMMENT = re.compile(r"^\s*;+\s*#:\s?(.*)$")
+_TRAILING_DOC_COMMENT = re.compile(r";+\s*#:\s?(.*)$")
+
+FINAL_DECORATORS = frozenset({"final", "typing.final"})
+
+
+def member_name(name: str) -> str:
+    """Return *name* as the Hy documenters spell members: unmangled."""
+    return ".".join(unmangle(mangle(part)) for part in name.split("."))
+
+
+class HyModuleAnalyzer(ModuleAnalyzer):
+    """A :class:`~sphinx.pycode.ModuleAnalyzer` reading Hy sources.
+
+    It records the order and line span of definitions (``tagorder`` and
+    ``tags``, for ``autodoc_member_order = "bysource"``), the documentation
+    of attributes set with ``setv`` (``attr_docs``, from ``;; #:`` comments
+    before or after the form or a string following it), their annotations
+    and the definitions decorated with ``final``.  Names are qualified and
+    unmangled, like the members the Hy documenters produce.
+    """
+
+    def analyze(self) -> None:
+        if self._analyzed:
+            return None
+
+        try:
+            self.source = HySource(self.code, self.srcname)
+        except Unsupported as exc:
+            raise PycodeError(f"parsing {self.srcname!r} failed: {exc}") from exc
+
+        self.attr_docs = OrderedDict()
+        self.annotations = {}
+        self.finals = []
+        self.overloads = {}
+        self.tags = {}
+        self.tagorder = {}
+        forms = self.source.forms
+        if forms and isinstance(forms[0], String):
+            forms = forms[1:]
+        self._visit_body(forms, "")
+        self._analyzed = True
+
+    def _add_tag(self, name: str, kind: Optional[str], form: Object) -> None:
+        self.tagorder.setdefault(name, len(self.tagorder))
+        if kind is not None:
+            self.tags[name] = (kind, form.start_line, form.end_line)
+
+    def _comment(self, form: Object) -> Optional[str]:
+        lines = self.source.lines
+        comment = []
+        lineno = form.start_line - 2
+        while lineno >= 0:
+            match = _DOC_COMMENT.match(lines[lineno])
+            if not match:
+                break
+            comment.insert(0, match.group(1))
+            lineno -= 1
+        if not comment and form.end_line <= len(lines):
+            match = _TRAILING_DOC_COMMENT.search(
+                lines[form.end_line - 1][form.end_column :]
+            )
+            if match:
+                comment.append(match.group(1))
+        return "\n".join(comment) if comment else None
+
+    def _visit_body(self, forms: List[Object], scope: str, this: str = None):
+        """Visit the forms of a module, a class (*scope*) or a method
+        (*this*, the name of its first parameter)."""
+        prefix = scope + "." if scope else ""
+        assigned = []  # the names set by the previous form
+        for form in forms:
+            head = _head(form)
+            if isinstance(form, String) and assigned:
+                for name in assigned:
+                    self.attr_docs[scope, name] = inspect.cleandoc(
+                        str(form)
+                    ).splitlines() + [""]
+            assigned = []
+
+            if head == "setv":
+                assigned = self._visit_setv(form, scope, this)
+            elif this is not None:
+                continue
+            elif head in ("defn", "defmacro", "defreader", "defclass"):
+                self._visit_definition(form, head, prefix)
+
+    def _visit_setv(self, form: Expression, scope: str, this: Optional[str]):
+        names = []
+        args = list(form[1:])
+        for target in args[::2]:
+            annotation = None
+            if _head(target) == "annotate" and len(target) == 3:
+                target, annotation = target[1], self.source.text(target[2])
+            if this is not None:
+                # (setv self.name value) reads as (setv (. self name) value)
+                if not (
+                    _head(target) == "."
+                    and len(target) == 3
+                    and target[1] == Symbol(this)
+                    and isinstance(target[2], Symbol)
+                ):
+                    continue
+                target = target[2]
+            if not isinstance(target, Symbol):
+                continue
+            name = member_name(str(target))
+            names.append(name)
+            if this is None:
+                self._add_tag(f"{scope}.{name}" if scope else name, None, form)
+            if annotation is not None:
+                self.annotations[scope, name] = annotation
+
+        comment = self._comment(form)
+        if comment is not None:
+            for name in names:
+                self.attr_docs[scope, name] = comment.splitlines() + [""]
+        return names
+
+    def _visit_definition(self, form: Expression, head: str, prefix: str):
+        rest = list(form[1:])
+        decorators = []
+        if rest and isinstance(rest[0], HyList):
+            decorators = [self.source.text(decorator) for decorator in rest.pop(0)]
+        while rest and isinstance(rest[0], Keyword):
+            rest = rest[2:] if rest[0] != Keyword("async") else rest[1:]
+        if rest and _head(rest[0]) == "annotate" and len(rest[0]) == 3:
+            rest[0] = rest[0][1]
+        if not rest or not isinstance(rest[0], Symbol):
+            return
+
+        raw_name = str(rest.pop(0))
+        name = prefix + (raw_name if head == "defreader" else member_name(raw_name))
+        self._add_tag(name, "class" if head == "defclass" else "def", form)
+        if FINAL_DECORATORS.intersection(decorators):
+            self.finals.append(name)
+
+        if head == "defclass":
+            if rest and isinstance(rest[0], HyList):
+                rest.pop(0)
+            self._visit_body(rest, name)
+        elif head == "defn" and prefix and rest and isinstance(rest[0], HyList):
+            # instance attributes set in methods
+            params = [p[1] if _head(p) == "annotate" else p for p in rest[0]]
+            if params and isinstance(params[0], Symbol):
+                self._visit_body(rest[1:], prefix[:-1], str(params[0]))
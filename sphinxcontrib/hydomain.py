@@ -15,10 +15,27 @@
 import ast
 import inspect
 import logging
+import os
 import re
 import sys
+import time
+from collections import Counter
+from collections.abc import Mapping
 from inspect import Parameter
-from typing import Any, Dict, Iterator, List, Tuple, cast
+from itertools import count
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import hy
 from docutils import nodes
@@ -36,34 +53,105 @@ from sphinx.domains.python import (
     PythonModuleIndex,
     pairindextypes,
 )
-from sphinx.environment import BuildEnvironment
+from sphinx.environment import CONFIG_OK, BuildEnvironment
 from sphinx.locale import _, __
 from sphinx.pycode.ast import parse as ast_parse
+from sphinx.pycode.ast import unparse as ast_unparse
 from sphinx.roles import XRefRole
 from sphinx.util.docutils import SphinxDirective
-from sphinx.util.inspect import signature_from_ast
+from sphinx.util.inspect import DefaultValue
 from sphinx.util.nodes import make_id, make_refnode
 
 import sphinxcontrib.hy_documenters as doc
+from sphinxcontrib.hy_cache import (
+    MISSING,
+    DiskCache,
+    build_cache,
+    evict_caches,
+    file_digest,
+    mangle,
+    report_caches,
+    reset_caches,
+    unmangle,
+)
+
+try:
+    from importlib.metadata import version
+
+    __version__ = version("sphinxcontrib-hydomain")
+except Exception:
+    __version__ = "unknown"
 
 # ** Consts
 logging.getLogger().setLevel(logging.DEBUG)
+logger = logging.getLogger("hy-domain")
+
+hy_directive_re = re.compile(
+    r"^\s*\.\.\s+hy:(?:function|macro|tag|method|classmethod|staticmethod"
+    r"|decorator|decoratormethod|class|exception)::\s+(\(.*\))\s*$"
+)
+
+# Failures cached alongside successful compilations, so that signatures
+# handled by the pseudo parser are not recompiled for every directive
+SIGNATURE_FAILURES = (SyntaxError, NotImplementedError)
+
+# Bumped whenever the cached signature representation changes
+SIGNATURE_CACHE_FORMAT = 2
+
+# Bump when anything the extension stores in the environment changes; Sphinx
+# then discards environments pickled by earlier versions
+ENV_VERSION = 2
+
+
+def _parse_expr(source: str) -> ast.expr:
+    return ast.parse(source, mode="eval").body
+
 
-hy_sexp_sig_re = re.compile(
-    r"""
-^\(
-    (?:\s*\^(?P<retann>\(.*\) | [^\s]+?)\s+)? # Optional: return annotation
-    (?P<module>[\w.]+::)?                       # Explicit module name
-    (?P<classes>.*\.)?                         # Module and/or class name(s)
-    (?P<object>.+?) \s*                        # Thing name
-    (?:                                        # Arguments/close or just close
-      (?:\[(?:\s*(?P<arguments>.*)\s*\]\))?) | # Optional: arguments
-      (?:\)))
-$
-    """,
-    re.VERBOSE,
+def _dump_signature(sig: inspect.Signature) -> List:
+    return [
+        [
+            param.name,
+            int(param.kind),
+            None if param.default is param.empty else str(param.default),
+            None if param.annotation is param.empty else ast_unparse(param.annotation),
+        ]
+        for param in sig.parameters.values()
+    ]
+
+
+def _load_signature(data: List) -> inspect.Signature:
+    kinds = type(Parameter.POSITIONAL_ONLY)
+    return inspect.Signature(
+        [
+            Parameter(
+                name,
+                kinds(kind),
+                default=Parameter.empty if default is None else DefaultValue(default),
+                annotation=(
+                    Parameter.empty if annotation is None else _parse_expr(annotation)
+                ),
+            )
+            for name, kind, default, annotation in data
+        ]
+    )
+
+
+signature_cache = build_cache(
+    "signatures",
+    maxsize=4096,
+    disk=DiskCache(_dump_signature, _load_signature, SIGNATURE_FAILURES),
+)
+hy2py_cache = build_cache(
+    "hy2py",
+    maxsize=4096,
+    disk=DiskCache(ast_unparse, _parse_expr, SIGNATURE_FAILURES),
 )
-hy_var_re = re.compile(r"^([\w.]*\.)?(.+?)$")
+annotation_cache = build_cache("annotations", maxsize=4096)
+xref_cache = build_cache("xrefs", maxsize=16384)
+
+# Stamps every state of every domain's object table, and is part of the
+# xref_cache keys, so that changing the table invalidates earlier lookups
+_generations = count()
 
 
 # ** Node Types
@@ -90,25 +178,353 @@ def bool_option(arg):
     return True
 
 
-def hy2py(source: str) -> str:
+def normalize_source(source: str) -> str:
+    """Normalize Hy source text for use as a cache key.
+    Runs of whitespace are only collapsed when the source has no string
+    literals, whose contents must be kept verbatim.
+    """
+    if '"' in source:
+        return source.strip()
+    return " ".join(source.split())
+
+
+def _hy2py_ast(source: str) -> ast.expr:
     hst = hy.read(source)
-    pyast = hy.compiler.hy_compile(hst, "__main__").body[1]
-    return ast.unparse(pyast)
+    module = hy.compiler.hy_compile(hst, "__main__")
+    # a string literal on its own becomes the docstring, not an expression
+    start = 0 if ast.get_docstring(module, clean=False) is None else 1
+    for node in module.body[start:]:
+        if isinstance(node, ast.Expr):
+            return node.value
+    raise NotImplementedError(f"{source!r} does not compile to an expression")
 
 
-def signature_from_str(signature: str) -> inspect.Signature:
+def hy2py_ast(source: str) -> ast.expr:
+    """Compile a Hy expression to the Python AST node of its value.
+    The node is shared between callers and must not be modified.
+    """
+    return hy2py_cache.lookup(
+        normalize_source(source), lambda: _hy2py_ast(source), SIGNATURE_FAILURES
+    )
+
+
+class HyAnnotation(NamedTuple):
+    """An annotation compiled from its Hy source, which is shown as written
+    when the compiled node cannot be rendered."""
+
+    source: str
+    node: Optional[ast.expr]
+
+
+def hy_annotation(source: str) -> HyAnnotation:
+    try:
+        return HyAnnotation(source, hy2py_ast(source))
+    except SIGNATURE_FAILURES:
+        return HyAnnotation(source, None)
+
+
+def hy2py(source: str) -> str:
+    return ast.unparse(hy2py_ast(source))
+
+
+def _signature_from_funcdef(node: ast.FunctionDef) -> inspect.Signature:
+    """Like :func:`signature_from_ast`, but annotations are kept as AST nodes
+    for :func:`_parse_annotation` instead of being rendered to source."""
+    args = node.args
+    positionals = [
+        *((arg, Parameter.POSITIONAL_ONLY) for arg in args.posonlyargs),
+        *((arg, Parameter.POSITIONAL_OR_KEYWORD) for arg in args.args),
+    ]
+    defaults = [None] * (len(positionals) - len(args.defaults)) + args.defaults
+    keywords = [(arg, Parameter.KEYWORD_ONLY) for arg in args.kwonlyargs]
+
+    params = []
+    for (arg, kind), default in zip(
+        positionals + keywords, defaults + list(args.kw_defaults)
+    ):
+        params.append(
+            Parameter(
+                arg.arg,
+                kind,
+                default=(
+                    Parameter.empty
+                    if default is None
+                    else DefaultValue(ast_unparse(default))
+                ),
+                annotation=arg.annotation or Parameter.empty,
+            )
+        )
+    if args.vararg:
+        params.insert(
+            len(positionals),
+            Parameter(
+                args.vararg.arg,
+                Parameter.VAR_POSITIONAL,
+                annotation=args.vararg.annotation or Parameter.empty,
+            ),
+        )
+    if args.kwarg:
+        params.append(
+            Parameter(
+                args.kwarg.arg,
+                Parameter.VAR_KEYWORD,
+                annotation=args.kwarg.annotation or Parameter.empty,
+            )
+        )
+
+    return inspect.Signature(params)
+
+
+def _compile_signature(signature: str) -> inspect.Signature:
     # NOTE Likely where the crash on -sentinel bug is happening
     code = "(defn func" + signature + ")"
     hst = hy.read(code)
     module = hy.compiler.hy_compile(hst, "__main__")
     function = cast(ast.FunctionDef, module.body[1])
 
-    return signature_from_ast(function)
+    return _signature_from_funcdef(function)
+
+
+class NativeParseUnsupported(Exception):
+    """Raised for lambda lists the native parser leaves to the Hy compiler."""
+
+
+_CONSTANT_SYMBOLS = {"None": None, "True": True, "False": False, "...": ...}
+_CONSTANT_MODELS = {
+    hy.models.Integer: int,
+    hy.models.Float: float,
+    hy.models.Complex: complex,
+    hy.models.String: str,
+    hy.models.Bytes: bytes,
+}
+
+
+def _model_to_ast(model: hy.models.Object) -> ast.expr:
+    """Convert a default value or annotation model to the Python expression
+    the Hy compiler would produce for it."""
+    if isinstance(model, hy.models.Symbol):
+        if str(model) in _CONSTANT_SYMBOLS:
+            return ast.Constant(value=_CONSTANT_SYMBOLS[str(model)])
+        parts = model.split(".")
+        if not all(parts):
+            raise NativeParseUnsupported(model)
+        node = ast.Name(id=mangle(parts[0]), ctx=ast.Load())
+        for part in parts[1:]:
+            node = ast.Attribute(value=node, attr=mangle(part), ctx=ast.Load())
+        return node
+    elif type(model) in _CONSTANT_MODELS:
+        return ast.Constant(value=_CONSTANT_MODELS[type(model)](model))
+    elif isinstance(model, hy.models.Expression):
+        module = hy.compiler.hy_compile(model, "__main__")
+        if len(module.body) != 2 or not isinstance(module.body[1], ast.Expr):
+            raise NativeParseUnsupported(model)
+        return module.body[1].value
+
+    raise NativeParseUnsupported(model)
+
+
+def _is_form(model: hy.models.Object, head: str, length: int) -> bool:
+    return (
+        isinstance(model, hy.models.Expression)
+        and len(model) == length
+        and model[0] == hy.models.Symbol(head)
+    )
+
+
+def _param_name(model: hy.models.Object) -> str:
+    if (
+        not isinstance(model, hy.models.Symbol)
+        or model.startswith("&")
+        or "." in model
+        or str(model) in ("/", "*")
+    ):
+        raise NativeParseUnsupported(model)
+    return mangle(model)
+
+
+def parse_lambda_list(signature: str) -> inspect.Signature:
+    """Build a signature from a Hy lambda list such as ``[a / [b 1] #* args]``
+    by walking the models read from it, without compiling a function.
+    Raises :class:`NativeParseUnsupported` for anything it does not handle.
+    """
+    lambda_list = hy.read(signature)
+    if not isinstance(lambda_list, hy.models.List):
+        raise NativeParseUnsupported(signature)
+
+    params = []  # type: List[Parameter]
+    kind = Parameter.POSITIONAL_OR_KEYWORD
+    bare_star = None  # type: Optional[int]
+    for item in lambda_list:
+        annotation = Parameter.empty
+        if _is_form(item, "annotate", 3):
+            item, annotation = item[1], _model_to_ast(item[2])
+
+        if kind is None:
+            # nothing may follow #** kwargs
+            raise NativeParseUnsupported(signature)
+        elif item == hy.models.Symbol("/") and annotation is Parameter.empty:
+            if kind != Parameter.POSITIONAL_OR_KEYWORD or any(
+                param.kind == Parameter.POSITIONAL_ONLY for param in params
+            ):
+                raise NativeParseUnsupported(signature)
+            if not params:
+                raise SyntaxError("at least one argument must precede /")
+            params = [param.replace(kind=Parameter.POSITIONAL_ONLY) for param in params]
+        elif item == hy.models.Symbol("*") and annotation is Parameter.empty:
+            if kind != Parameter.POSITIONAL_OR_KEYWORD:
+                raise NativeParseUnsupported(signature)
+            kind = Parameter.KEYWORD_ONLY
+            bare_star = len(params)
+        elif _is_form(item, "unpack-iterable", 2):
+            if kind != Parameter.POSITIONAL_OR_KEYWORD:
+                raise NativeParseUnsupported(signature)
+            params.append(
+                Parameter(
+                    _param_name(item[1]),
+                    Parameter.VAR_POSITIONAL,
+                    annotation=annotation,
+                )
+            )
+            kind = Parameter.KEYWORD_ONLY
+        elif _is_form(item, "unpack-mapping", 2):
+            params.append(
+                Parameter(
+                    _param_name(item[1]), Parameter.VAR_KEYWORD, annotation=annotation
+                )
+            )
+            kind = None
+        elif isinstance(item, hy.models.List) and len(item) == 2:
+            params.append(
+                Parameter(
+                    _param_name(item[0]),
+                    kind,
+                    default=DefaultValue(ast_unparse(_model_to_ast(item[1]))),
+                    annotation=annotation,
+                )
+            )
+        else:
+            params.append(Parameter(_param_name(item), kind, annotation=annotation))
+
+    if bare_star is not None and not any(
+        param.kind == Parameter.KEYWORD_ONLY for param in params[bare_star:]
+    ):
+        raise SyntaxError("named arguments must follow bare *")
+    try:
+        return inspect.Signature(params)
+    except ValueError as exc:
+        # let the compiler report misordered or duplicate parameters
+        raise NativeParseUnsupported(signature) from exc
+
+
+def _signature_from_str(signature: str) -> inspect.Signature:
+    try:
+        return parse_lambda_list(signature)
+    except NativeParseUnsupported:
+        return _compile_signature(signature)
+
+
+def compile_signatures(signatures: List[str]) -> None:
+    """Cache the signatures of several lambda lists at once.
+    Lambda lists the native parser cannot handle are compiled together as
+    one module of many ``defn``s instead of one module each.
+    """
+    pending = {}  # type: Dict[str, str]
+    for signature in signatures:
+        key = normalize_source(signature)
+        if key in pending or signature_cache.fetch(key) is not MISSING:
+            continue
+        try:
+            signature_cache.store(key, parse_lambda_list(signature))
+        except NativeParseUnsupported:
+            pending[key] = signature
+        except SIGNATURE_FAILURES:
+            # left for signature_from_str to report
+            pass
+
+    _compile_batch(list(pending.items()))
+
+
+def _compile_batch(signatures: List[Tuple[str, str]]) -> None:
+    if not signatures:
+        return
+
+    code = "\n".join(
+        "(defn _hy_sig_%d %s)" % (i, signature)
+        for i, (key, signature) in enumerate(signatures)
+    )
+    try:
+        module = hy.compiler.hy_compile(hy.read_many(code), "__main__")
+        functions = {
+            node.name: node for node in module.body if isinstance(node, ast.FunctionDef)
+        }
+        results = [
+            _signature_from_funcdef(functions["_hy_sig_%d" % i])
+            for i in range(len(signatures))
+        ]
+    except (*SIGNATURE_FAILURES, KeyError, ValueError):
+        if len(signatures) > 1:
+            # isolate the failing signatures so only they get the fallback
+            middle = len(signatures) // 2
+            _compile_batch(signatures[:middle])
+            _compile_batch(signatures[middle:])
+        else:
+            [(key, signature)] = signatures
+            try:
+                signature_cache.lookup(
+                    key, lambda: _compile_signature(signature), SIGNATURE_FAILURES
+                )
+            except (*SIGNATURE_FAILURES, ValueError):
+                pass
+        return
+
+    for (key, signature), result in zip(signatures, results):
+        signature_cache.store(key, result)
+
+
+def signature_from_str(signature: str) -> inspect.Signature:
+    return signature_cache.lookup(
+        normalize_source(signature),
+        lambda: _signature_from_str(signature),
+        SIGNATURE_FAILURES,
+    )
 
 
 def _parse_arglist(arglist: str, env: BuildEnvironment = None):
-    params = desc_hyparameterlist(arglist)
     sig = signature_from_str("[%s]" % arglist)
+    return _signature_to_parameterlist(sig, arglist, env)
+
+
+def _autodoc_parameterlist(
+    parameters: List[doc.HyParameter], arglist: str, env: BuildEnvironment = None
+):
+    """Build the parameter list from the parameters an autodoc documenter
+    recorded for a signature, compiling only their annotations."""
+    sig = inspect.Signature(
+        [
+            Parameter(
+                param.name,
+                param.kind,
+                default=(
+                    Parameter.empty
+                    if param.default is None
+                    else DefaultValue(param.default)
+                ),
+                annotation=(
+                    Parameter.empty
+                    if param.annotation is None
+                    else hy_annotation(param.annotation)
+                ),
+            )
+            for param in parameters
+        ]
+    )
+    return _signature_to_parameterlist(sig, arglist, env)
+
+
+def _signature_to_parameterlist(
+    sig: inspect.Signature, arglist: str, env: BuildEnvironment = None
+):
+    params = desc_hyparameterlist(arglist)
     # first_default = True
     last_kind = None
 
@@ -135,24 +551,25 @@ def _parse_arglist(arglist: str, env: BuildEnvironment = None):
             nonlocal node
             if param.annotation is not param.empty:
                 children = _parse_annotation(param.annotation, env)
-                node += desc_hyannotation(param.annotation, "", *children)
+                rawsource = "".join(child.astext() for child in children)
+                node += desc_hyannotation(rawsource, "", *children)
                 node += nodes.Text(" ")
 
         if param.kind == param.VAR_POSITIONAL:
             node += addnodes.desc_sig_operator(" ", "#*")
             node += nodes.Text(" ")
             annotate(param)
-            node += addnodes.desc_sig_name("", hy.unmangle(param.name))
+            node += addnodes.desc_sig_name("", unmangle(param.name))
         elif param.kind == param.VAR_KEYWORD:
             node += addnodes.desc_sig_operator("", "#**")
             node += nodes.Text(" ")
             annotate(param)
-            node += addnodes.desc_sig_name("", hy.unmangle(param.name))
+            node += addnodes.desc_sig_name("", unmangle(param.name))
         else:
             annotate(param)
             if param.default is not param.empty:
                 node += nodes.Text("[")
-            node += addnodes.desc_sig_name("", hy.unmangle(param.name))
+            node += addnodes.desc_sig_name("", unmangle(param.name))
 
         if param.default is not param.empty:
             if param.annotation is not param.empty:
@@ -206,10 +623,14 @@ def type_to_xref(text: str, env: BuildEnvironment = None) -> addnodes.pending_xr
     )
 
 
-def _parse_annotation(annotation: str, env: BuildEnvironment = None) -> List[Node]:
-    """Parse type annotation."""
+def _annotation_skeleton(
+    annotation: Union[str, ast.AST, HyAnnotation]
+) -> Tuple[Tuple[str, str], ...]:
+    """Parse type annotation, given as Python source, as an AST node or as a
+    compiled Hy annotation, into ``(kind, text)`` pairs, where *kind* is
+    ``"xref"`` for type names and ``"punct"`` for punctuation."""
 
-    def unparse(node: ast.AST, isslice=False) -> List[Node]:
+    def unparse(node: ast.AST) -> List[Node]:
         if isinstance(node, ast.Attribute):
             return [nodes.Text(f"{unparse(node.value)[0]}.{node.attr}")]
         elif isinstance(node, ast.Expr):
@@ -236,32 +657,18 @@ def _parse_annotation(annotation: str, env: BuildEnvironment = None) -> List[Nod
                 *result,
                 nodes.Text(" "),
             ]
-            result.extend(unparse(node.slice, isslice=True))
+            result.extend(unparse(node.slice))
             addnodes.desc_sig_punctuation("", ")"),
             result.append(addnodes.desc_sig_punctuation("", ")"))
             return result
         elif isinstance(node, ast.Tuple):
+            result = [addnodes.desc_sig_punctuation("", "#(")]
+            for elem in node.elts:
+                result.extend(unparse(elem))
+                result.append(addnodes.desc_sig_punctuation("", " "))
             if node.elts:
-                result = []
-                if not isslice:
-                    result.append(addnodes.desc_sig_punctuation("", "(, "))
-                if len(node.elts) > 1:
-                    result.append(addnodes.desc_sig_punctuation("", "("))
-                    result.append(nodes.Text(", "))
-                for elem in node.elts:
-                    result.extend(unparse(elem))
-                    result.append(addnodes.desc_sig_punctuation("", " "))
-                if len(node.elts) > 1:
-                    result.append(addnodes.desc_sig_punctuation("", ")"))
                 result.pop()
-                if not isslice:
-                    result.append(addnodes.desc_sig_punctuation("", ")"))
-            else:
-                result = [
-                    addnodes.desc_sig_punctuation("", "(,"),
-                    addnodes.desc_sig_punctuation("", ")"),
-                ]
-
+            result.append(addnodes.desc_sig_punctuation("", ")"))
             return result
         else:
             if sys.version_info >= (3, 6):
@@ -280,14 +687,50 @@ def _parse_annotation(annotation: str, env: BuildEnvironment = None) -> List[Nod
             raise SyntaxError  # unsupported syntax
 
     try:
-        tree = ast_parse(annotation)
+        if isinstance(annotation, HyAnnotation):
+            if annotation.node is None:
+                raise SyntaxError(annotation.source)
+            tree = annotation.node
+        elif isinstance(annotation, str):
+            tree = ast_parse(annotation)
+        else:
+            tree = annotation
         result = unparse(tree)
-        for i, node in enumerate(result):
-            if isinstance(node, nodes.Text):
-                result[i] = type_to_xref(str(node), env)
-        return result
+        return tuple(
+            ("xref", str(node))
+            if isinstance(node, nodes.Text)
+            else ("punct", node.astext())
+            for node in result
+        )
     except SyntaxError:
-        return [type_to_xref(annotation, env)]
+        if isinstance(annotation, HyAnnotation):
+            annotation = annotation.source
+        elif not isinstance(annotation, str):
+            annotation = ast_unparse(annotation)
+        return (("xref", annotation),)
+
+
+def _parse_annotation(
+    annotation: Union[str, ast.AST, HyAnnotation], env: BuildEnvironment = None
+) -> List[Node]:
+    """Parse type annotation.
+    AST nodes, as produced by :func:`hy2py_ast`, are rendered directly
+    without a round trip through Python source.
+    """
+    # nodes are keyed by structure, as each signature is parsed separately
+    if isinstance(annotation, HyAnnotation):
+        key = ("hy", annotation.source)
+    elif isinstance(annotation, str):
+        key = annotation
+    else:
+        key = ("ast", ast.dump(annotation))
+    skeleton = annotation_cache.lookup(key, lambda: _annotation_skeleton(annotation))
+    return [
+        type_to_xref(text, env)
+        if kind == "xref"
+        else addnodes.desc_sig_punctuation("", text)
+        for kind, text in skeleton
+    ]
 
 
 # ** Objects
@@ -330,21 +773,12 @@ class HyModuleIndex(PythonModuleIndex):
 
 class HyObject(PyObject):
     def handle_signature(self, sig: str, signode) -> Tuple[str, str]:
-        isvar = False
-        msexp = hy_sexp_sig_re.match(sig)
-        mvar = hy_var_re.match(sig)
-        if msexp is not None:
-            retann, *prefix, name, arglist = msexp.groups()
-            if prefix:
-                prefix = ".".join(filter(None, prefix))
-            else:
-                prefix = None
-        elif mvar is not None:
-            isvar = True
-            prefix, name = mvar.groups()
-            retann, arglist = None, None
-        else:
+        scanned = doc.scan_hy_sig(sig)
+        if scanned is None:
             raise ValueError
+        retann, module, classes, name, arglist, sexp = scanned
+        isvar = not sexp
+        prefix = ".".join(filter(None, (module, classes))) or None
 
         # determine module and class name (if applicable), as well as full name
         modname = self.options.get("module", self.env.ref_context.get("hy:module"))
@@ -397,7 +831,14 @@ class HyObject(PyObject):
 
         signode += addnodes.desc_name(name, name)
 
-        if arglist:
+        parameters = self.env.temp_data.get("hy:autodoc_signatures", {}).get(sig)
+        if arglist and parameters is not None:
+            try:
+                signode += _autodoc_parameterlist(parameters, arglist, self.env)
+            except (*SIGNATURE_FAILURES, ValueError):
+                parameters = None
+
+        if arglist and parameters is None:
             try:
                 signode += _parse_arglist(arglist, self.env)
             except SyntaxError:
@@ -407,7 +848,7 @@ class HyObject(PyObject):
             except NotImplementedError as exc:
                 logging.warning("could not parse arglist (%r): %s", exc)
                 _pseudo_parse_arglist(signode, arglist)
-        else:
+        elif not arglist:
             if self.needs_arglist():
                 # for callables, add an empty parameter list
                 signode += desc_hyparameterlist()
@@ -420,10 +861,9 @@ class HyObject(PyObject):
             signode += addnodes.desc_addname(")", ")")
 
         if retann:
-            pyretann = hy2py(retann)
-            children = _parse_annotation(pyretann, self.env)
+            children = _parse_annotation(hy_annotation(retann), self.env)
             signode += nodes.Text(" ")
-            signode += desc_hyreturns(pyretann, "", *children)
+            signode += desc_hyreturns(retann, "", *children)
 
         return fullname, prefix
 
@@ -827,6 +1267,26 @@ class HyDecoratorMethod(HyMethod):
         return False
 
 
+class _EntryTable(Mapping):
+    """A read-only view decoding the compact entries of the domain data."""
+
+    def __init__(self, entries: Dict[str, tuple], decode: Callable) -> None:
+        self._entries = entries
+        self._decode = decode
+
+    def __getitem__(self, name: str):
+        return self._decode(name, self._entries[name])
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class HyDomain(Domain):
     name = "hy"
     label = "HY"
@@ -876,13 +1336,73 @@ class HyDomain(Domain):
         "obj": HyXRefRole(),
     }
 
-    initial_data = {"objects": {}, "modules": {}}
+    # Objects are stored as (docname, objtype code) tuples, extended with
+    # the node id and the aliased flag only where they differ from the
+    # fullname and False.  Modules are few, and read as ModuleEntry by
+    # PythonModuleIndex, so they are kept as is.  Docnames are interned so
+    # that pickle stores each of them once.
+    initial_data = {
+        "objects": {},  # fullname -> compact ObjectEntry
+        "modules": {},  # modname -> ModuleEntry
+        "object_docs": {},  # docname -> {fullname: None}
+        "module_docs": {},  # docname -> {modname: None}
+        "references": {},  # docname -> {xref key: None}
+        "resolutions": {},  # xref key -> ((fullname, docname, node_id), ...)
+    }
+    data_version = 3
 
     indices = [HyModuleIndex]
 
+    _objtypes = tuple(object_types)
+    _objtype_codes = {objtype: code for code, objtype in enumerate(_objtypes)}
+
+    def __init__(self, env: BuildEnvironment) -> None:
+        super().__init__(env)
+        # last name component -> fullnames, in the order of self.objects, for
+        # the fuzzy lookups of find_obj.  Not part of the pickled domain data.
+        self._suffix_index = {}  # type: Dict[str, Dict[str, None]]
+        for fullname in self.objects:
+            self._index_object(fullname)
+        self._generation = next(_generations)
+        # (type, target) -> count of the references that did not resolve
+        self.unresolved = Counter()  # type: Counter[Tuple[str, str]]
+
+    @classmethod
+    def _encode_object(cls, name: str, obj: ObjectEntry) -> tuple:
+        code = cls._objtype_codes.get(obj.objtype, obj.objtype)
+        entry = (sys.intern(obj.docname), code)
+        if obj.aliased:
+            return entry + (obj.node_id, True)
+        elif obj.node_id != name:
+            return entry + (obj.node_id,)
+        return entry
+
+    @classmethod
+    def _decode_object(cls, name: str, entry: tuple) -> ObjectEntry:
+        code = entry[1]
+        return ObjectEntry(
+            entry[0],
+            entry[2] if len(entry) > 2 else name,
+            code if isinstance(code, str) else cls._objtypes[code],
+            len(entry) > 3 and entry[3],
+        )
+
+    def _index_object(self, fullname: str) -> None:
+        last = fullname.rpartition(".")[2]
+        self._suffix_index.setdefault(last, {})[fullname] = None
+
+    def _unindex_object(self, fullname: str) -> None:
+        last = fullname.rpartition(".")[2]
+        fullnames = self._suffix_index.get(last)
+        if fullnames is not None:
+            fullnames.pop(fullname, None)
+            if not fullnames:
+                del self._suffix_index[last]
+
     @property
-    def objects(self):
-        return self.data.setdefault("objects", {})
+    def objects(self) -> Mapping:
+        # fullname -> ObjectEntry
+        return _EntryTable(self.data["objects"], self._decode_object)
 
     def note_object(
         self,
@@ -902,7 +1422,25 @@ class HyDomain(Domain):
                 name,
                 other.docname,
             )
-        self.objects[name] = ObjectEntry(self.env.docname, node_id, objtype, aliased)
+        self._add_object(
+            name,
+            self._encode_object(
+                name, ObjectEntry(self.env.docname, node_id, objtype, aliased)
+            ),
+        )
+
+    def _add_object(self, name: str, entry: tuple) -> None:
+        objects = self.data["objects"]
+        if name in objects:
+            self.object_docs.get(objects[name][0], {}).pop(name, None)
+        objects[name] = entry
+        self.object_docs.setdefault(entry[0], {})[name] = None
+        self._index_object(name)
+        self._generation = next(_generations)
+
+    @property
+    def object_docs(self) -> Dict[str, Dict[str, None]]:
+        return self.data.setdefault("object_docs", {})  # docname -> {fullname}
 
     @property
     def modules(self) -> Dict[str, ModuleEntry]:
@@ -914,26 +1452,102 @@ class HyDomain(Domain):
         """Note a python module for cross reference.
         .. versionadded:: 2.1
         """
-        self.modules[name] = ModuleEntry(
-            self.env.docname, node_id, synopsis, platform, deprecated
+        self._add_module(
+            name,
+            ModuleEntry(
+                sys.intern(self.env.docname), node_id, synopsis, platform, deprecated
+            ),
         )
 
+    def _add_module(self, name: str, mod: ModuleEntry) -> None:
+        if name in self.modules:
+            self.module_docs.get(self.modules[name].docname, {}).pop(name, None)
+        self.modules[name] = mod
+        self.module_docs.setdefault(mod.docname, {})[name] = None
+        self._generation = next(_generations)
+
+    @property
+    def module_docs(self) -> Dict[str, Dict[str, None]]:
+        return self.data.setdefault("module_docs", {})  # docname -> {modname}
+
     def clear_doc(self, docname: str) -> None:
-        for fullname, obj in list(self.objects.items()):
-            if obj.docname == docname:
-                del self.objects[fullname]
-        for modname, mod in list(self.modules.items()):
-            if mod.docname == docname:
-                del self.modules[modname]
+        for fullname in self.object_docs.pop(docname, ()):
+            del self.data["objects"][fullname]
+            self._unindex_object(fullname)
+        for modname in self.module_docs.pop(docname, ()):
+            del self.modules[modname]
+        self.references.pop(docname, None)
+        self._generation = next(_generations)
+
+    @property
+    def references(self) -> Dict[str, Dict[tuple, None]]:
+        return self.data.setdefault("references", {})
+
+    @staticmethod
+    def _xref_key(node: pending_xref) -> tuple:
+        return (
+            node["reftype"],
+            node["reftarget"],
+            node.get("hy:module"),
+            node.get("hy:class"),
+            1 if node.hasattr("refspecific") else 0,
+        )
+
+    def process_doc(
+        self, env: BuildEnvironment, docname: str, document: nodes.document
+    ) -> None:
+        references = {
+            self._xref_key(node): None
+            for node in document.findall(pending_xref)
+            if node.get("refdomain") == self.name
+        }
+        if references:
+            self.references[docname] = references
+
+    def _resolution(self, key: tuple) -> tuple:
+        type, target, modname, clsname, searchmode = key
+        matches = self._lookup_xref(
+            self.env, modname, clsname, target, type, searchmode
+        )
+        return tuple((name, obj.docname, obj.node_id) for name, obj in matches)
+
+    def get_updated_docs(self) -> List[str]:
+        """Return the documents with references that resolve differently than
+        when they were last written, and record how they resolve now."""
+        old = self.data["resolutions"]
+        new = {}  # type: Dict[tuple, tuple]
+        updated = []
+        for docname, keys in self.references.items():
+            changed = False
+            for key in keys:
+                if key not in new:
+                    new[key] = self._resolution(key)
+                if key in old and old[key] != new[key]:
+                    changed = True
+            if changed:
+                updated.append(docname)
+        self.data["resolutions"] = new
+        return updated
 
     def merge_domaindata(self, docnames: List[str], otherdata: Dict) -> None:
-        # XXX check duplicates?
-        for fullname, obj in otherdata["objects"].items():
-            if obj.docname in docnames:
-                self.objects[fullname] = obj
-        for modname, mod in otherdata["modules"].items():
-            if mod.docname in docnames:
-                self.modules[modname] = mod
+        for docname in docnames:
+            for fullname in otherdata["object_docs"].get(docname, ()):
+                if fullname in self.objects:
+                    logging.warning(
+                        __(
+                            "duplicate object description of %s, "
+                            "other instance in %s, use :noindex: for one of them"
+                        ),
+                        fullname,
+                        self.objects[fullname].docname,
+                    )
+                entry = otherdata["objects"][fullname]
+                self._add_object(fullname, (sys.intern(entry[0]),) + entry[1:])
+            for modname in otherdata["module_docs"].get(docname, ()):
+                mod = otherdata["modules"][modname]
+                self._add_module(modname, mod._replace(docname=sys.intern(mod.docname)))
+            if docname in otherdata["references"]:
+                self.references[docname] = otherdata["references"][docname]
 
     def find_obj(
         self,
@@ -984,9 +1598,10 @@ class HyDomain(Domain):
                     else:
                         # "fuzzy" searching mode
                         searchname = "." + name
+                        candidates = self._suffix_index.get(name.rpartition(".")[2], ())
                         matches = [
                             (oname, self.objects[oname])
-                            for oname in self.objects
+                            for oname in candidates
                             if oname.endswith(searchname)
                             and self.objects[oname].objtype in objtypes
                         ]
@@ -1011,6 +1626,29 @@ class HyDomain(Domain):
             matches.append((newname, self.objects[newname]))
         return matches
 
+    def _lookup_xref(
+        self,
+        env: BuildEnvironment,
+        modname: str,
+        classname: str,
+        target: str,
+        type: str,
+        searchmode: int,
+    ) -> List[Tuple[str, ObjectEntry]]:
+        """Memoized :meth:`find_obj`, falling back from ``attr`` to ``meth``."""
+
+        def lookup():
+            matches = self.find_obj(env, modname, classname, target, type, searchmode)
+            if not matches and type == "attr":
+                # fallback to meth (for property)
+                matches = self.find_obj(
+                    env, modname, classname, target, "meth", searchmode
+                )
+            return matches
+
+        key = (self._generation, modname, classname, target, type, searchmode)
+        return xref_cache.lookup(key, lookup)
+
     def resolve_xref(
         self,
         env: BuildEnvironment,
@@ -1024,13 +1662,10 @@ class HyDomain(Domain):
         modname = node.get("hy:module")
         clsname = node.get("hy:class")
         searchmode = 1 if node.hasattr("refspecific") else 0
-        matches = self.find_obj(env, modname, clsname, target, type, searchmode)
-
-        if not matches and type == "attr":
-            # fallback to meth (for property)
-            matches = self.find_obj(env, modname, clsname, target, "meth", searchmode)
+        matches = self._lookup_xref(env, modname, clsname, target, type, searchmode)
 
         if not matches:
+            self.unresolved[type, target] += 1
             return None
         elif len(matches) > 1:
             logging.warning(
@@ -1059,7 +1694,7 @@ class HyDomain(Domain):
         results = []  # type: List[Tuple[str, Element]]
 
         # always search in "refspecific" mode with the :any: role
-        matches = self.find_obj(env, modname, clsname, target, None, 1)
+        matches = self._lookup_xref(env, modname, clsname, target, None, 1)
         for name, obj in matches:
             if obj[2] == "module":
                 results.append(
@@ -1161,9 +1796,8 @@ def d_html_hyparameter(self, node):
 
 
 def v_html_hyannotation(self, node):
-    self.param_separator = self.param_separator.replace(",", "")
     if self.body[-2] != ("["):
-        self.body.append(self.param_separator)
+        self.body.append(self.param_separator.replace(",", ""))
     if node.hasattr("lambda_keyword"):
         self.body.append('<em class="lambda_keyword text-muted">^')
     elif node.hasattr("keyword"):
@@ -1181,9 +1815,207 @@ def d_html_hyannotation(self, node):
         self.body.append("</em>")
 
 
+# ** Event Handlers
+def configure_persistent_caches(app: Sphinx) -> None:
+    """Keep compiled signatures under the doctree directory between builds."""
+    directory = None
+    if app.config.hy_persistent_cache:
+        directory = os.path.join(app.doctreedir, "hy-cache")
+    salt = "%s\0%s\0%d" % (hy.__version__, __version__, SIGNATURE_CACHE_FORMAT)
+
+    for cache in (signature_cache, hy2py_cache):
+        cache.disk.configure(
+            directory and os.path.join(directory, cache.name),
+            app.config.hy_persistent_cache_size,
+            salt,
+        )
+
+
+def batch_compile_signatures(app: Sphinx, docname: str, source: List[str]) -> None:
+    """Compile the arglists of all ``hy:`` object directives in a document
+    before it is parsed, so the directives only have to look them up."""
+    if not app.config.hy_batch_compile_signatures:
+        return
+
+    signatures = []
+    for line in source[0].splitlines():
+        directive = hy_directive_re.match(line)
+        if directive is None:
+            continue
+        scanned = doc.scan_hy_sig(directive.group(1))
+        if scanned is not None and scanned.arguments:
+            signatures.append("[%s]" % scanned.arguments)
+
+    compile_signatures(signatures)
+
+
+def _hy_source_unchanged(env: BuildEnvironment, filename: str) -> bool:
+    """Whether *filename* still has the content recorded in the manifest."""
+    recorded = env.hy_source_hashes.get(filename)
+    if recorded is None:
+        return False
+    try:
+        mtime = os.path.getmtime(filename)
+        if mtime != recorded[0]:
+            if file_digest(filename) != recorded[1]:
+                return False
+            env.hy_source_hashes[filename] = (mtime, recorded[1])
+    except OSError:
+        return False
+    return True
+
+
+def skip_unchanged_hy_dependencies(
+    app: Sphinx, env: BuildEnvironment, docnames: List[str]
+) -> None:
+    """Don't reread documents that are only outdated because the Hy sources
+    they depend on were touched, when their content is unchanged."""
+    if not hasattr(env, "hy_source_hashes"):
+        env.hy_source_hashes = {}  # filename -> (mtime, sha256)
+    if not app.config.hy_hash_dependencies or env.config_status != CONFIG_OK:
+        return
+
+    # documents with failed imports that may succeed now
+    retry = env.temp_data.get("hy:retry_imports", ())
+
+    for docname in list(docnames):
+        mtime = env.all_docs.get(docname)
+        if (
+            mtime is None
+            or docname in retry
+            or docname in env.reread_always
+            or not os.path.isfile(os.path.join(env.doctreedir, docname + ".doctree"))
+            or os.path.getmtime(env.doc2path(docname)) > mtime
+        ):
+            continue
+
+        touched = []
+        for dep in env.dependencies[docname]:
+            filename = os.path.normpath(os.path.join(env.srcdir, dep))
+            try:
+                if os.path.getmtime(filename) > mtime:
+                    touched.append(filename)
+            except OSError:
+                break
+        else:
+            if touched and all(
+                filename.endswith(".hy") and _hy_source_unchanged(env, filename)
+                for filename in touched
+            ):
+                docnames.remove(docname)
+                env.all_docs[docname] = time.time()
+
+
+def record_hy_dependency_hashes(app: Sphinx, env: BuildEnvironment) -> None:
+    """Hash the Hy sources the documents depend on, rehashing only those
+    whose modification time changed."""
+    hashes = {}
+    for deps in env.dependencies.values():
+        for dep in deps:
+            filename = os.path.normpath(os.path.join(env.srcdir, dep))
+            if not filename.endswith(".hy") or filename in hashes:
+                continue
+            try:
+                mtime = os.path.getmtime(filename)
+                recorded = getattr(env, "hy_source_hashes", {}).get(filename)
+                if recorded is None or recorded[0] != mtime:
+                    recorded = (mtime, file_digest(filename))
+            except OSError:
+                continue
+            if recorded[1] is None:
+                continue
+            hashes[filename] = recorded
+    env.hy_source_hashes = hashes
+
+
+def retry_failed_imports(
+    app: Sphinx,
+    env: BuildEnvironment,
+    added: Set[str],
+    changed: Set[str],
+    removed: Set[str],
+) -> List[str]:
+    """Reread the documents where an import failed, if the sources involved
+    changed or a module that was missing can now be found."""
+    retry = []
+    failures = getattr(env, "hy_import_failures", {})
+    for docname, keys in getattr(env, "hy_import_failure_docs", {}).items():
+        if docname in removed:
+            continue
+        if any(not failures[key].is_current() for key in keys):
+            retry.append(docname)
+    env.temp_data["hy:retry_imports"] = set(retry)
+    return retry
+
+
+def purge_import_failures(app: Sphinx, env: BuildEnvironment, docname: str) -> None:
+    getattr(env, "hy_import_failure_docs", {}).pop(docname, None)
+
+
+def merge_import_failures(
+    app: Sphinx, env: BuildEnvironment, docnames: Set[str], other: BuildEnvironment
+) -> None:
+    for docname in docnames:
+        keys = getattr(other, "hy_import_failure_docs", {}).get(docname)
+        for key in keys or ():
+            doc.note_import_failure(env, key, other.hy_import_failures[key], docname)
+
+
+def prune_import_failures(app: Sphinx, env: BuildEnvironment) -> None:
+    """Forget the failures no document ran into anymore."""
+    if hasattr(env, "hy_import_failures"):
+        keys = set().union(*env.hy_import_failure_docs.values())
+        env.hy_import_failures = {
+            key: failure
+            for key, failure in env.hy_import_failures.items()
+            if key in keys
+        }
+
+
+def rewrite_changed_references(app: Sphinx, env: BuildEnvironment) -> List[str]:
+    """Write again the documents whose Hy references now resolve elsewhere."""
+    return env.get_domain("hy").get_updated_docs()
+
+
+def report_unresolved_xrefs(app: Sphinx, exception) -> None:
+    """Log the Hy targets most often referenced without being found."""
+    if exception or "hy" not in app.env.domains:
+        return
+
+    unresolved = app.env.get_domain("hy").unresolved
+    if unresolved:
+        logger.info(
+            "[hy-xref] %d unresolved references to %d targets, most common: %s",
+            sum(unresolved.values()),
+            len(unresolved),
+            ", ".join(
+                "%s:%s (%d)" % (type, target, n)
+                for (type, target), n in unresolved.most_common(10)
+            ),
+        )
+
+
 # ** Register with Sphinx
 def setup(app: Sphinx):
     app.add_domain(HyDomain)
+    app.connect("builder-inited", reset_caches)
+    app.connect("builder-inited", configure_persistent_caches)
+    app.connect("build-finished", report_caches)
+    app.connect("build-finished", evict_caches)
+    app.connect("build-finished", report_unresolved_xrefs)
+    app.connect("env-get-updated", rewrite_changed_references)
+    app.connect("env-before-read-docs", skip_unchanged_hy_dependencies)
+    app.connect("env-updated", record_hy_dependency_hashes)
+    app.connect("env-get-outdated", retry_failed_imports)
+    app.connect("env-purge-doc", purge_import_failures)
+    app.connect("env-merge-info", merge_import_failures)
+    app.connect("env-updated", prune_import_failures)
+    app.add_config_value("hy_batch_compile_signatures", False, "env")
+    app.add_config_value("hy_persistent_cache", True, "")
+    app.add_config_value("hy_persistent_cache_size", 20000, "")
+    app.add_config_value("hy_hash_dependencies", True, "")
+    app.add_config_value("hy_static_analysis", False, "env")
+    app.connect("source-read", batch_compile_signatures)
     app.add_node(desc_hyreturns, html=(v_hyreturns, d_hyreturns))
     app.add_node(desc_hyparameterlist, html=(v_hyparameterlist, d_hyparameterlist))
     app.add_node(desc_hyparameter, html=(v_html_hyparameter, d_html_hyparameter))
@@ -1215,3 +2047,16 @@ def setup(app: Sphinx):
 
     app.registry.add_documenter("hy:exception", doc.HyExceptionDocumenter)
     app.add_directive_to_domain("hy", "autoexception", doc.HyAutodocDirective)
+
+    app.registry.add_documenter("hy:data", doc.HyDataDocumenter)
+    app.add_directive_to_domain("hy", "autodata", doc.HyAutodocDirective)
+
+    app.registry.add_documenter("hy:attribute", doc.HyAttributeDocumenter)
+    app.add_directive_to_domain("hy", "autoattribute", doc.HyAutodocDirective)
+
+    return {
+        "version": __version__,
+        "env_version": ENV_VERSION,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath("."))
+
+project = "parallel"
+extensions = ["sphinx.ext.autodoc", "sphinxcontrib.hydomain"]
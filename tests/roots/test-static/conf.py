@@ -0,0 +1,8 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath("."))
+
+project = "static"
+extensions = ["sphinx.ext.autodoc", "sphinxcontrib.hydomain"]
+hy_static_analysis = True
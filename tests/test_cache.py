@@ -0,0 +1,101 @@
+import ast
+
+import pytest
+
+from sphinxcontrib import hydomain
+from sphinxcontrib.hy_cache import BuildCache
+
+
+def test_lru_eviction():
+    cache = BuildCache("test", maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_signature_cache_hits_and_failures():
+    hydomain.signature_cache.clear()
+    hydomain.signature_cache.reset_stats()
+
+    first = hydomain.signature_from_str("[x  #* args #** kwargs]")
+    second = hydomain.signature_from_str("[x #* args #** kwargs]")
+    assert first is second
+
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            hydomain.signature_from_str("[x")
+
+    assert hydomain.signature_cache.misses == 2
+    assert hydomain.signature_cache.hits == 2
+
+
+def test_annotation_cache_matches_equal_nodes():
+    hydomain.annotation_cache.clear()
+    hydomain.annotation_cache.reset_stats()
+    first = hydomain._parse_annotation(ast.parse("List[int]", mode="eval").body)
+    second = hydomain._parse_annotation(ast.parse("List[int]", mode="eval").body)
+
+    assert [node.astext() for node in first] == [node.astext() for node in second]
+    assert hydomain.annotation_cache.hits == 1
+    assert len(hydomain.annotation_cache) == 1
+
+
+def test_disk_cache_roundtrip_and_eviction(tmp_path):
+    disk = BuildCache(
+        "disk",
+        disk=hydomain.DiskCache(
+            hydomain._dump_signature,
+            hydomain._load_signature,
+            hydomain.SIGNATURE_FAILURES,
+        ),
+    )
+    disk.disk.configure(str(tmp_path), maxsize=1, salt="test")
+
+    signature = hydomain.parse_lambda_list("[a / [b 1] * #^ int c #** kw]")
+    disk.store("[a / [b 1] * #^ int c #** kw]", signature)
+    disk.clear()
+    assert hydomain._dump_signature(
+        disk.fetch("[a / [b 1] * #^ int c #** kw]")
+    ) == hydomain._dump_signature(signature)
+
+    with pytest.raises(SyntaxError):
+        disk.lookup("[x", lambda: hydomain._compile_signature("[x"), SyntaxError)
+    disk.clear()
+    with pytest.raises(SyntaxError):
+        disk.lookup("[x", None)
+
+    disk.disk.evict()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_mangle_memo():
+    import hy
+
+    from sphinxcontrib.hy_cache import mangle, mangle_cache, unmangle, unmangle_cache
+
+    mangle_cache.reset_stats()
+    unmangle_cache.reset_stats()
+    for name in ["is-odd?", "->arrow", "*starred*", "_private", "a.b-c"]:
+        for _ in range(3):
+            assert mangle(name) == hy.mangle(name)
+            assert unmangle(mangle(name)) == hy.unmangle(hy.mangle(name))
+
+    assert mangle(hy.models.Symbol("is-odd?")) == "hyx_is_oddXquestion_markX"
+    assert mangle_cache.hits >= 10
+    assert unmangle_cache.hits >= 10
+
+
+def test_annotation_only_members_are_unmangled():
+    from sphinx.util.inspect import safe_getattr
+
+    from sphinxcontrib.hy_documenters import get_object_members
+
+    class Annotated:
+        hyx_is_validXquestion_markX: bool
+
+    members = get_object_members(Annotated, ["Annotated"], safe_getattr)
+    assert members["is-valid?"].directly_defined
@@ -0,0 +1,154 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from sphinx.application import Sphinx
+
+from sphinxcontrib.hydomain import HyDomain, hy2py_ast
+
+
+def make_domain(nobjects=0):
+    domain = HyDomain(SimpleNamespace(domaindata={}, docname="index"))
+    for i in range(nobjects):
+        domain.note_object(f"pkg.mod{i}.Class{i}.method{i}", "method", f"id{i}")
+    return domain
+
+
+def fuzzy(domain, name, type="meth"):
+    matches = domain.find_obj(None, None, None, name, type, 1)
+    return [fullname for fullname, obj in matches]
+
+
+def test_fuzzy_find_obj():
+    domain = make_domain()
+    domain.note_object("a.b.frob", "function", "a.b.frob")
+    domain.note_object("c.frob", "method", "c.frob")
+    domain.note_object("c.Thing.frob", "method", "c.Thing.frob")
+    domain.note_object("frob", "function", "frob")
+
+    assert fuzzy(domain, "frob", "func") == ["frob"]
+    assert fuzzy(domain, "frob", "meth") == ["c.frob", "c.Thing.frob"]
+    assert fuzzy(domain, "Thing.frob") == ["c.Thing.frob"]
+    assert fuzzy(domain, "b.frob", None) == ["a.b.frob"]
+
+    domain.env.docname = "other"
+    domain.note_object("d.frob", "method", "d.frob")
+    domain.clear_doc("index")
+    assert fuzzy(domain, "frob") == ["d.frob"]
+
+    other = make_domain()
+    other.env.docname = "third"
+    other.note_object("e.frob", "method", "e.frob")
+    domain.merge_domaindata(["third"], other.data)
+    assert fuzzy(domain, "frob") == ["d.frob", "e.frob"]
+
+    assert fuzzy(HyDomain(domain.env), "frob") == ["d.frob", "e.frob"]
+
+
+def test_fuzzy_find_obj_scales_with_matches():
+    def resolve_time(nobjects):
+        domain = make_domain(nobjects)
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for i in range(200):
+                assert fuzzy(domain, f"method{i}")
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    small, large = resolve_time(200), resolve_time(20000)
+    assert large < small * 5
+
+
+def test_clear_doc_only_touches_its_own_entries():
+    domain = make_domain()
+    domain.note_object("a.frob", "function", "a.frob")
+    domain.note_module("a", "module-a", "", "", False)
+    domain.env.docname = "other"
+    domain.note_object("a.frob", "function", "a.frob")  # duplicate wins
+    domain.note_object("b.frob", "function", "b.frob")
+
+    domain.clear_doc("index")
+    assert list(domain.objects) == ["a.frob", "b.frob"]
+    assert domain.modules == {}
+
+    other = make_domain()
+    other.env.docname = "third"
+    other.note_object("a.frob", "function", "a.frob")
+    other.note_object("c.frob", "function", "c.frob")
+    domain.merge_domaindata(["third"], other.data)
+
+    domain.clear_doc("other")
+    assert list(domain.objects) == ["a.frob", "c.frob"]
+    assert domain.objects["a.frob"].docname == "third"
+    assert domain.object_docs == {"third": {"a.frob": None, "c.frob": None}}
+
+
+def test_compact_objects_pickle_smaller():
+    import pickle
+
+    from sphinx.domains.python import ObjectEntry
+
+    domain = make_domain()
+    for i in range(5000):
+        domain.env.docname = "api/module%d" % (i // 50)
+        name = "pkg.module%d.func%d" % (i // 50, i)
+        domain.note_object(name, "function", name)
+    objects = {
+        name: ObjectEntry(docname, name, "function", False)
+        for docname, fullnames in domain.object_docs.items()
+        for name in fullnames
+    }
+    old = pickle.dumps({"objects": objects, "object_docs": domain.object_docs})
+
+    assert len(pickle.dumps(domain.data)) < len(old) * 0.85
+
+
+def test_xref_lookups_are_memoized_until_objects_change():
+    from sphinx.addnodes import pending_xref
+
+    from sphinxcontrib.hydomain import xref_cache
+
+    domain = make_domain()
+    node = pending_xref("", refspecific=True)
+    xref_cache.reset_stats()
+
+    for _ in range(3):
+        resolved = domain.resolve_xref(None, "index", None, "func", "frob", node, None)
+        assert resolved is None
+    assert (xref_cache.misses, xref_cache.hits) == (1, 2)
+    assert domain.unresolved == {("func", "frob"): 3}
+
+    domain.note_object("a.frob", "function", "a.frob")
+    assert domain._lookup_xref(None, None, None, "frob", "func", 1) == [
+        ("a.frob", domain.objects["a.frob"])
+    ]
+    domain.clear_doc("index")
+    assert domain._lookup_xref(None, None, None, "frob", "func", 1) == []
+
+    domain.note_object("a.Thing.size", "method", "a.Thing.size")
+    assert domain._lookup_xref(None, "a", "Thing", "size", "attr", 0) == [
+        ("a.Thing.size", domain.objects["a.Thing.size"])
+    ]
+
+
+def test_string_return_annotation(tmp_path):
+    assert hy2py_ast("(get List int)").value.id == "List"
+    with pytest.raises(NotImplementedError):
+        hy2py_ast('"Foo"')
+
+    (tmp_path / "conf.py").write_text('extensions = ["sphinxcontrib.hydomain"]\n')
+    (tmp_path / "index.rst").write_text('.. hy:function:: (^"Foo" f [x])\n')
+    app = Sphinx(
+        str(tmp_path),
+        str(tmp_path),
+        str(tmp_path / "out"),
+        str(tmp_path / "out" / ".doctrees"),
+        "text",
+        status=None,
+        warning=None,
+        freshenv=True,
+    )
+    app.build()
+
+    assert "(f(x))  -> \"Foo\"" in (tmp_path / "out" / "index.txt").read_text()
@@ -6,3 +6,40 @@ def test_imports():
     importlib.import_module("sphinxcontrib.hydomain")
 
     assert True
+
+
+def test_import_object_is_memoized():
+    import pytest
+
+    from sphinxcontrib.hy_documenters import import_object, module_cache, object_cache
+
+    module_cache.clear()
+    object_cache.clear()
+
+    first = import_object("json.decoder", ["JSONDecoder", "decode"], "method")
+    assert import_object("json.decoder", ["JSONDecoder", "decode"], "method") is first
+    assert first[2:] == ["decode", importlib.import_module("json").JSONDecoder.decode]
+
+    # the parent retry loop imports each candidate module once
+    for _ in range(3):
+        with pytest.raises(ImportError, match="failed to import function"):
+            import_object("json.no_such_module.thing", [], "function")
+    assert len(module_cache) == 4
+    assert ("json.no_such_module", ()) in module_cache
+    assert object_cache.hits == 1 + 2
+
+    def getter(obj, name, *defargs):
+        return "got " + name
+
+    decode = import_object("json.decoder", ["JSONDecoder", "decode"], "method", getter)
+    assert decode[2:] == ["decode", "got decode"]
+    assert (
+        import_object(
+            "json.decoder", ["JSONDecoder", "decode"], "method", warningiserror=True
+        )
+        is not first
+    )
+
+    macros = importlib.import_module("hy.core.macros")._hy_macros
+    when = import_object("hy.core.macros", ["when"], "macro", macro=True)
+    assert when[2:] == ["when", macros["when"]]
@@ -0,0 +1,161 @@
+import importlib
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+ROOT = Path(__file__).parent / "roots" / "test-incremental"
+
+
+def build(srcdir, outdir):
+    app = Sphinx(
+        str(srcdir),
+        str(srcdir),
+        str(outdir),
+        str(outdir / ".doctrees"),
+        "html",
+        status=None,
+        warning=None,
+    )
+    app.read_docnames = set()
+    app.connect(
+        "env-before-read-docs",
+        lambda app, env, docnames: app.read_docnames.update(docnames),
+    )
+    app.build()
+    return app
+
+
+@pytest.fixture(autouse=True)
+def fresh_modules():
+    # every test imports the fixture modules from its own copy of the root
+    yield
+    for modname in ("inc_mod", "inc_helpers", "inc_broken", "inc_missing_dep"):
+        sys.modules.pop(modname, None)
+
+
+def test_rewrites_documents_whose_references_changed(tmp_path):
+    srcdir = tmp_path / "src"
+    outdir = tmp_path / "out"
+    shutil.copytree(ROOT, srcdir)
+    build(srcdir, outdir)
+    assert 'href="api.html#api.twiddle"' not in (outdir / "user.html").read_text()
+
+    for page in ("user.html", "other.html"):
+        (outdir / page).write_text("stale")
+
+    with open(srcdir / "api.rst", "a") as f:
+        f.write("\n.. hy:function:: (twiddle [x])\n")
+    app = build(srcdir, outdir)
+
+    assert 'href="api.html#api.twiddle"' in (outdir / "user.html").read_text()
+    assert (outdir / "other.html").read_text() == "stale"
+    assert app.env.get_domain("hy").data["resolutions"][
+        ("func", "api.twiddle", None, None, 0)
+    ] == (
+        ("api.twiddle", "api", "api.twiddle"),
+    )
+
+
+def test_hy_sources_are_dependencies(tmp_path):
+    srcdir = tmp_path / "src"
+    outdir = tmp_path / "out"
+    shutil.copytree(ROOT, srcdir)
+    app = build(srcdir, outdir)
+    assert app.env.dependencies["auto"] == {"inc_mod.hy", "inc_helpers.hy"}
+
+    with open(srcdir / "inc_helpers.hy", "a") as f:
+        f.write("\n(defmacro thrice [x] `(do ~x ~x ~x))\n")
+    sys.modules.pop("inc_helpers")
+    sys.modules.pop("inc_mod")
+    app = build(srcdir, outdir)
+    assert app.read_docnames == {"auto"}
+
+
+def test_touched_hy_sources_with_same_content_are_not_reread(tmp_path):
+    srcdir = tmp_path / "src"
+    outdir = tmp_path / "out"
+    shutil.copytree(ROOT, srcdir)
+    build(srcdir, outdir)
+
+    helpers = srcdir / "inc_helpers.hy"
+    later = time.time() + 10
+    os.utime(helpers, (later, later))
+    assert build(srcdir, outdir).read_docnames == set()
+    assert build(srcdir, outdir).read_docnames == set()
+
+    helpers.write_text(helpers.read_text() + "\n;; changed\n")
+    os.utime(helpers, (later + 10, later + 10))
+    assert build(srcdir, outdir).read_docnames == {"auto"}
+
+
+def test_unchanged_import_failures_are_replayed(tmp_path, monkeypatch):
+    import sphinxcontrib.hy_documenters as doc
+
+    srcdir = tmp_path / "src"
+    outdir = tmp_path / "out"
+    shutil.copytree(ROOT, srcdir)
+    app = build(srcdir, outdir)
+
+    key = ("inc_broken", ("thing",), "function", ())
+    assert app.env.hy_import_failure_docs == {"broken": {key}}
+    failure = app.env.hy_import_failures[key]
+    assert failure.missing == ("inc_missing_dep",)
+    assert str(srcdir / "inc_broken.hy") in failure.sources
+
+    assert build(srcdir, outdir).read_docnames == set()
+
+    imports = []
+    import_object = doc.import_object
+    monkeypatch.setattr(
+        doc,
+        "import_object",
+        lambda modname, *args, **kwargs: (
+            imports.append(modname) or import_object(modname, *args, **kwargs)
+        ),
+    )
+    (srcdir / "broken.rst").write_text((srcdir / "broken.rst").read_text() + "\n")
+    app = build(srcdir, outdir)
+    assert app.read_docnames == {"broken"}
+    assert imports == []
+    assert app.env.hy_import_failure_docs == {"broken": {key}}
+
+    (srcdir / "inc_missing_dep.hy").write_text("(setv x 1)\n")
+    importlib.invalidate_caches()
+    app = build(srcdir, outdir)
+    assert app.read_docnames == {"broken"}
+    assert imports == ["inc_broken"]
+    assert app.env.hy_import_failure_docs == {}
+    assert app.env.hy_import_failures == {}
+
+
+def test_import_failure_description():
+    import hy
+
+    from sphinxcontrib.hy_documenters import import_failure
+
+    try:
+        try:
+            hy.eval(hy.read("(import inc_no_such_dep)"))
+        except ImportError as exc:
+            raise ImportError("failed to import inc_broken", exc) from exc
+    except ImportError as exc:
+        failure = import_failure("inc_broken", exc)
+    assert failure.message == "failed to import inc_broken"
+    assert failure.missing == ("inc_no_such_dep",)
+    # installed packages the import went through are recorded, the stdlib not
+    assert any(
+        name.startswith(os.path.dirname(hy.__file__)) for name in failure.sources
+    )
+    assert not any(
+        name.startswith(os.path.dirname(os.__file__) + os.sep + "importlib")
+        for name in failure.sources
+    )
+
+    failure = import_failure("inc_broken", ImportError("plain"))
+    assert failure.message == "plain"
+    assert failure.missing == ()
@@ -0,0 +1,158 @@
+import ast
+
+import pytest
+
+from sphinxcontrib.hydomain import (
+    NativeParseUnsupported,
+    _compile_signature,
+    parse_lambda_list,
+)
+
+LAMBDA_LISTS = [
+    "[]",
+    "[self]",
+    "[x #* args #** kwargs]",
+    "[a [b None]]",
+    "[a / b]",
+    "[a / b * c [d 1]]",
+    "[#* args b [c 2]]",
+    "[* a [b 1]]",
+    '[[a -1] [b -0.5] [c "G"] [d b"x"] [e True] [f ...] [g 1j]]',
+    "[[something -sentinel] [h foo.bar]]",
+    "[valid? ->arrow *starred*]",
+    "[#^ int a #^ float [c 42.0] #^ str #* args #^ dict d]",
+    "[#^ (get List str) x #^ foo.Bar y #^ (get Dict (, str int)) #** kwargs]",
+    "[^Point other]",
+    "[#^ None x]",
+]
+
+
+def describe(signature):
+    return [
+        (
+            param.name,
+            param.kind,
+            None if param.default is param.empty else str(param.default),
+            None if param.annotation is param.empty else ast.dump(param.annotation),
+        )
+        for param in signature.parameters.values()
+    ]
+
+
+@pytest.mark.parametrize("lambda_list", LAMBDA_LISTS)
+def test_native_matches_compiler(lambda_list):
+    native = parse_lambda_list(lambda_list)
+    compiled = _compile_signature(lambda_list)
+
+    assert describe(native) == describe(compiled)
+
+
+@pytest.mark.parametrize(
+    "lambda_list", ["[&optional x]", "[:x]", "[[a 1] b]", "[a a]", "[x #** kw y]"]
+)
+def test_native_defers_to_compiler(lambda_list):
+    with pytest.raises(NativeParseUnsupported):
+        parse_lambda_list(lambda_list)
+
+
+@pytest.mark.parametrize("lambda_list", ["[/]", "[*]", "[x *]", "[* #** kw]"])
+def test_native_rejects_invalid_markers(lambda_list):
+    with pytest.raises(SyntaxError):
+        _compile_signature(lambda_list)
+    with pytest.raises(SyntaxError):
+        parse_lambda_list(lambda_list)
+
+
+def test_batch_compile_isolates_failures():
+    from sphinxcontrib.hydomain import compile_signatures, signature_cache
+
+    signatures = ["[&optional x]", "[[a 1] b]", "[&rest xs]", "[y]"]
+    signature_cache.clear()
+    compile_signatures(signatures)
+
+    assert len(signature_cache) == len(signatures)
+    assert str(signature_cache.get("[&optional x]")) == "(hyx_XampersandXoptional, x)"
+    with pytest.raises(SyntaxError):
+        signature_cache.lookup("[[a 1] b]", None)
+
+
+def test_autodoc_parameters_match_arglist():
+    import hy
+
+    from sphinxcontrib.hy_documenters import structured_signature
+    from sphinxcontrib.hydomain import _autodoc_parameterlist, _parse_arglist
+
+    func = hy.eval(hy.read("(fn [a #^ int b [c None] #* rest d #** kw] None)"))
+    retann, arglist, parameters = structured_signature(func)
+
+    assert arglist == "[a ^int b [c None] #* rest d #** kw]"
+    assert [(p.name, p.default, p.annotation) for p in parameters] == [
+        ("a", None, None),
+        ("b", None, "int"),
+        ("c", "None", None),
+        ("rest", None, None),
+        ("d", None, None),
+        ("kw", None, None),
+    ]
+
+    rendered = _autodoc_parameterlist(parameters, arglist[1:-1]).astext()
+    expected = _parse_arglist("a #^ int b [c None] #* rest d #** kw").astext()
+    assert rendered == expected
+    assert _parse_arglist(arglist[1:-1]).astext() == expected
+
+    func = hy.eval(hy.read("(fn [a * b [c 1]] None)"))
+    assert structured_signature(func)[1] == "[a * b [c 1]]"
+
+
+def test_autodoc_generic_annotations_render_as_hy():
+    from typing import Dict, Optional, Union
+
+    from sphinxcontrib.hy_documenters import structured_signature
+    from sphinxcontrib.hydomain import _autodoc_parameterlist
+
+    def func(d: Dict[str, int], u: Union[int, str], o: Optional[int]):
+        pass
+
+    retann, arglist, parameters = structured_signature(func)
+    assert arglist == (
+        "[^(get Dict #(str int)) d ^(get Union #(int str)) u ^(get Optional int) o]"
+    )
+    assert _autodoc_parameterlist(parameters, arglist[1:-1]).astext() == (
+        "(^(get Dict #(str int)) d ^(get Union #(int str)) u ^(get Optional int) o)"
+    )
+
+
+def test_structured_signature_is_cached_per_code_object():
+    import functools
+
+    import hy
+
+    from sphinxcontrib.hy_documenters import arglist_cache, structured_signature
+
+    Base, Child, make = hy.eval(
+        hy.read_many(
+            """
+            (defclass Base [] (defn method [self #^ int x [y 1]] None))
+            (defclass Child [Base])
+            (defn make [default] (fn [[z default]] z))
+            [Base Child make]
+            """
+        )
+    )
+    arglist_cache.clear()
+
+    first = structured_signature(Base.method, bound_method=True)
+    assert first[1] == "[^int x [y 1]]"
+    assert structured_signature(Child.method, bound_method=True) is first
+    assert structured_signature(Child().method, bound_method=True) is first
+    assert structured_signature(Base.method)[1] == "[self ^int x [y 1]]"
+
+    # closures share their code, but not their defaults
+    assert structured_signature(make(1))[1] == "[[z 1]]"
+    assert structured_signature(make(2))[1] == "[[z 2]]"
+
+    @functools.wraps(Base.method)
+    def wrapper(*args, **kwargs):
+        pass
+
+    assert structured_signature(wrapper, bound_method=True) is first
@@ -0,0 +1,153 @@
+import functools
+import sys
+
+import hy
+import pytest
+from sphinx.application import Sphinx
+from sphinx.ext.autodoc import (
+    ClassDocumenter,
+    FunctionDocumenter,
+    ModuleDocumenter,
+    PropertyDocumenter,
+)
+
+from sphinxcontrib.hy_documenters import (
+    HyClassDocumenter,
+    HyModuleDocumenter,
+    _scan_documenters,
+    dispatch_cache,
+    find_documenter,
+    get_module_members,
+    is_macro,
+    is_reader_macro,
+    member_cache,
+    module_snapshot,
+)
+
+
+@pytest.fixture
+def module(tmp_path, monkeypatch):
+    (tmp_path / "snapshot_mod.hy").write_text(
+        """
+(defmacro twice [x] "Twice." `(do ~x ~x))
+(defreader at (.slurp-space &reader) 1)
+(defn is-odd? [n] "Odd?" (% n 2))
+(setv #^ int count 1)
+"""
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield __import__("snapshot_mod")
+    sys.modules.pop("snapshot_mod", None)
+
+
+def test_module_snapshot(module):
+    member_cache.clear()
+    snapshot = module_snapshot(module)
+
+    names = [name for name, value in snapshot.members]
+    assert names == sorted(names)
+    assert {"twice", "is-odd?", "count"} <= set(names)
+    is_odd = snapshot.attributes[hy.mangle("is-odd?")]
+    assert is_odd is getattr(module, hy.mangle("is-odd?"))
+    assert snapshot.annotations == {"count": int}
+
+    twice = module._hy_macros["twice"]
+    assert is_macro(twice) and not is_reader_macro(twice)
+    assert is_reader_macro(module._hy_reader_macros["at"])
+    assert not is_macro(is_odd)
+    assert not hasattr(twice, "_hy_macro")
+
+    with pytest.raises(TypeError):
+        snapshot.attributes["count"] = 2
+
+    assert module_snapshot(module) is snapshot
+    assert get_module_members(module) == list(snapshot.members)
+    assert member_cache.hits == 2
+
+
+def test_documenter_dispatch_matches_full_scan(module, tmp_path):
+    (tmp_path / "conf.py").write_text(
+        'extensions = ["sphinx.ext.autodoc", "sphinxcontrib.hydomain"]\n'
+    )
+    (tmp_path / "index.rst").write_text("Index\n=====\n")
+    app = Sphinx(
+        str(tmp_path),
+        str(tmp_path),
+        str(tmp_path / "out"),
+        str(tmp_path / "out" / ".doctrees"),
+        "text",
+        status=None,
+        warning=None,
+    )
+    documenters = tuple(app.registry.documenters.values())
+
+    class Shape:
+        @property
+        def area(self):
+            return 0
+
+    members = [
+        module._hy_macros["twice"],
+        module._hy_reader_macros["at"],
+        getattr(module, hy.mangle("is-odd?")),
+        functools.partial(getattr(module, hy.mangle("is-odd?")), 1),
+        functools.wraps(len)(lambda x: x),
+        len,
+        1,
+        "text",
+        Shape,
+        Shape.area,
+        Shape.__dict__["area"],
+        ValueError,
+        None,
+    ]
+    parents = [
+        object.__new__(cls)
+        for cls in (
+            HyModuleDocumenter,
+            HyClassDocumenter,
+            ModuleDocumenter,
+            ClassDocumenter,
+        )
+    ]
+    for parent in parents:
+        parent.object = Shape
+    dispatch_cache.clear()
+    dispatch_cache.reset_stats()
+    for member in members:
+        for parent in parents:
+            for isattr in (False, True):
+                args = (member, "name", isattr, parent)
+                expected = _scan_documenters(documenters, *args)
+                assert find_documenter(documenters, *args) is expected
+    # members of the same kind share an entry
+    lookups = len(members) * len(parents) * 2
+    assert dispatch_cache.misses == len(dispatch_cache) < lookups
+
+    class Thing:
+        size = 3
+
+        @classmethod
+        @property
+        def cprop(cls):
+            return 3
+
+    # a property wrapped in classmethod is only told apart by the class dict
+    parent = object.__new__(ClassDocumenter)
+    parent.object = Thing
+    for name in ("size", "cprop"):
+        args = (getattr(Thing, name), name, False, parent)
+        assert find_documenter(documenters, *args) is _scan_documenters(
+            documenters, *args
+        )
+    assert find_documenter(documenters, 3, "cprop", False, parent) is PropertyDocumenter
+
+    hits = dispatch_cache.hits
+
+    class CustomDocumenter(FunctionDocumenter):
+        priority = 100
+
+    documenters += (CustomDocumenter,)
+    args = (module._hy_macros["twice"], "twice", False, parents[0])
+    assert find_documenter(documenters, *args) is CustomDocumenter
+    assert dispatch_cache.hits == hits
@@ -0,0 +1,68 @@
+import shutil
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+ROOT = Path(__file__).parent / "roots" / "test-parallel"
+
+
+def build(tmp_path, parallel):
+    srcdir = tmp_path / "src"
+    shutil.copytree(ROOT, srcdir)
+    outdir = tmp_path / "out"
+    warnings = StringIO()
+    app = Sphinx(
+        str(srcdir),
+        str(srcdir),
+        str(outdir),
+        str(tmp_path / "doctrees"),
+        "text",
+        status=None,
+        warning=warnings,
+        freshenv=True,
+        parallel=parallel,
+    )
+    app.build()
+    pages = {path.name: path.read_text() for path in sorted(outdir.glob("*.txt"))}
+    return app, pages
+
+
+@pytest.fixture(scope="module")
+def serial(tmp_path_factory):
+    return build(tmp_path_factory.mktemp("serial"), 0)
+
+
+@pytest.fixture(scope="module")
+def parallel(tmp_path_factory):
+    return build(tmp_path_factory.mktemp("parallel"), 4)
+
+
+def test_extension_is_parallel_safe(serial):
+    app, pages = serial
+    extension = app.extensions["sphinxcontrib.hydomain"]
+    assert extension.parallel_read_safe
+    assert extension.parallel_write_safe
+
+
+def test_parallel_build_matches_serial(serial, parallel):
+    serial_app, serial_pages = serial
+    parallel_app, parallel_pages = parallel
+
+    assert len(serial_pages) == 9
+    assert serial_pages == parallel_pages
+
+    serial_hy = serial_app.env.get_domain("hy")
+    parallel_hy = parallel_app.env.get_domain("hy")
+    assert serial_hy.objects == parallel_hy.objects
+    assert serial_hy.modules == parallel_hy.modules
+    assert serial_hy.object_docs.keys() == parallel_hy.object_docs.keys()
+    for docname, fullnames in serial_hy.object_docs.items():
+        assert set(fullnames) == set(parallel_hy.object_docs[docname])
+
+
+def test_parallel_build_resolves_references(parallel):
+    app, pages = parallel
+    assert "parallel_mod.greet" in pages["part3.txt"]
+    assert "class (parallel_mod.Counter(^int start))" in pages["part0.txt"]
@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from sphinxcontrib.hy_documenters import HySignature, match_hy_sig, scan_hy_sig
+
+
+@pytest.mark.parametrize(
+    "sig, expected",
+    [
+        ("(foo)", HySignature(None, None, None, "foo", None, True)),
+        (
+            "(foo [a [b None]])",
+            HySignature(None, None, None, "foo", "a [b None]", True),
+        ),
+        ("(^ [a b])", HySignature(None, None, None, "^", "a b", True)),
+        (
+            "(^(get List int) mod::Point.dist [x])",
+            HySignature("(get List int)", "mod::", "Point.", "dist", "x", True),
+        ),
+        ("(^int f [[c 42.0]])", HySignature("int", None, None, "f", "[c 42.0]", True)),
+        ("(foo [])", HySignature(None, None, None, "foo", None, True)),
+        ("(foo bar [x])", HySignature(None, None, None, "foo bar", "x", True)),
+        ("(foo [x] bar)", HySignature(None, None, None, "foo [x] bar", None, True)),
+        ("a.b.c-d?", HySignature(None, None, "a.b.", "c-d?", None, False)),
+        ("mod::x", HySignature(None, "mod::", None, "x", None, False)),
+        ("()", None),
+    ],
+)
+def test_scan_hy_sig(sig, expected):
+    assert scan_hy_sig(sig) == expected
+
+
+def test_match_hy_sig_order():
+    assert match_hy_sig("(^str mod::greet [name])") == (
+        "mod::",
+        None,
+        "greet",
+        "name",
+        "str",
+    )
+
+
+PATHOLOGICAL = [
+    "(^" + "(get " * 2000 + "x" + ")" * 2000 + " f [x])",
+    "(" + "a." * 20000 + "b [" + "x " * 20000 + "])",
+    "(" + "^(" * 5000 + " f)",
+    "(f [" + "[a 1.5] " * 10000 + "]",
+    "a" + "." * 50000 + "b",
+]
+
+
+@pytest.mark.parametrize("sig", PATHOLOGICAL, ids=range(len(PATHOLOGICAL)))
+def test_scan_time_is_bounded(sig):
+    start = time.perf_counter()
+    for _ in range(10):
+        scan_hy_sig(sig)
+    assert time.perf_counter() - start < 1.0
@@ -0,0 +1,184 @@
+import shutil
+import sys
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from sphinx.application import Sphinx
+
+ROOT = Path(__file__).parent / "roots" / "test-static"
+
+
+def build(tmp_path, static):
+    srcdir = tmp_path / "src"
+    shutil.copytree(ROOT, srcdir)
+    outdir = tmp_path / "out"
+    warnings = StringIO()
+    app = Sphinx(
+        str(srcdir),
+        str(srcdir),
+        str(outdir),
+        str(outdir / ".doctrees"),
+        "text",
+        status=None,
+        warning=warnings,
+        freshenv=True,
+        confoverrides={"hy_static_analysis": static},
+    )
+    app.build()
+    pages = {path.name: path.read_text() for path in sorted(outdir.glob("*.txt"))}
+    return pages, warnings.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def fresh_modules():
+    yield
+    for modname in ("static_mod", "static_guarded", "static_fallback", "mockmod"):
+        sys.modules.pop(modname, None)
+
+
+def test_static_mode_matches_import_mode(tmp_path):
+    imported, import_warnings = build(tmp_path / "import", False)
+    assert "static_mod" in sys.modules
+    sys.modules.pop("static_mod")
+
+    static, static_warnings = build(tmp_path / "static", True)
+
+    assert "static_mod" not in sys.modules
+    assert static["index.txt"] == imported["index.txt"]
+    assert "(static_mod.scale(^float x, [factor 2], #* rest," in static["index.txt"]
+    assert "macro(static_mod.unless*(test, #* body))" in static["index.txt"]
+
+
+def test_attribute_docs_and_source_order(tmp_path):
+    static, warnings = build(tmp_path, True)
+    index = static["index.txt"]
+
+    assert "static_mod.default-factor = 2\n\n   The factor" in index
+    assert "   sides\n\n      The lengths of the sides." in index
+    members = ("default-factor", "scale(", "Shape(", "unit(", "area(", " sides\n")
+    positions = [index.index(name) for name in members]
+    assert positions == sorted(positions)
+
+
+def test_static_mode_does_not_execute_modules(tmp_path):
+    static, warnings = build(tmp_path, True)
+
+    assert "static_guarded" not in sys.modules
+    assert "static_missing_dependency" not in warnings
+    assert "Document me without my dependency." in static["guarded.txt"]
+
+    # top-level code outside of the supported forms is imported
+    assert "static_fallback" in sys.modules
+    assert "Defined at import time." in static["fallback.txt"]
+
+
+def test_read_module_keeps_source_of_expressions(tmp_path):
+    from sphinxcontrib.hy_documenters import structured_signature
+    from sphinxcontrib.hy_source import Unsupported, read_module
+
+    source = tmp_path / "exprs.hy"
+    source.write_text(
+        '(defn f [#^ (get list int) xs [n (+ 1 2)] * [key "k"]] "Doc." xs)\n'
+        '(setv limit (* 2 1024) name "exprs")\n'
+    )
+    module = read_module(str(source), "exprs")
+
+    retann, arglist, parameters = structured_signature(module.f)
+    assert arglist == "[^(get list int) xs [n (+ 1 2)] * [key k]]"
+    assert module.f.__doc__ == "Doc."
+    assert module.f.__module__ == "exprs"
+    assert repr(module.limit) == "(* 2 1024)"
+    assert module.name == "exprs"
+
+    source.write_text("(defn f [] 1)\n(print 1)\n")
+    with pytest.raises(Unsupported, match="unsupported top-level form 'print'"):
+        read_module(str(source), "exprs")
+
+
+def test_module_analyzer():
+    from sphinxcontrib.hy_source import HyModuleAnalyzer
+
+    analyzer = HyModuleAnalyzer.for_string(
+        """"Module."
+
+;; #: The limit.
+(setv #^ int max-size 10)
+
+(setv plain 1)  ; #: A trailing comment.
+
+(defclass [final] Box []
+  (setv kind None)
+  "The kind of box."
+
+  (defn __init__ [self #^ int size]
+    (setv self.size size)
+    "The size.")
+
+  (defn [final] open? [self] True))
+""",
+        "boxes",
+        "boxes.hy",
+    )
+
+    assert analyzer.find_attr_docs() == {
+        ("", "max-size"): ["The limit.", ""],
+        ("", "plain"): ["A trailing comment.", ""],
+        ("Box", "kind"): ["The kind of box.", ""],
+        ("Box", "size"): ["The size.", ""],
+    }
+    assert analyzer.annotations == {("", "max-size"): "int"}
+    assert analyzer.finals == ["Box", "Box.open?"]
+    assert list(analyzer.tagorder) == [
+        "max-size",
+        "plain",
+        "Box",
+        "Box.kind",
+        "Box.__init__",
+        "Box.open?",
+    ]
+    assert analyzer.find_tags() == {
+        "Box": ("class", 8, 16),
+        "Box.__init__": ("def", 12, 14),
+        "Box.open?": ("def", 16, 16),
+    }
+
+
+def test_attribute_documenter_imports_with_mocks(tmp_path):
+    srcdir = tmp_path / "src"
+    srcdir.mkdir()
+    (srcdir / "conf.py").write_text(
+        "import os, sys\n"
+        "sys.path.insert(0, os.path.abspath('.'))\n"
+        'extensions = ["sphinx.ext.autodoc", "sphinxcontrib.hydomain"]\n'
+        'autodoc_mock_imports = ["heavydep"]\n'
+    )
+    (srcdir / "mockmod.hy").write_text(
+        "(import heavydep)\n"
+        "(defclass Thing []\n"
+        '  "A thing."\n'
+        "  (defn __init__ [self]\n"
+        "    (setv self.size 3)\n"
+        '    "The size."))\n'
+    )
+    (srcdir / "index.rst").write_text(
+        ".. hy:autoattribute:: mockmod.Thing.size\n\n"
+        ".. hy:automodule:: mockmod\n   :members:\n"
+    )
+    outdir = tmp_path / "out"
+    warnings = StringIO()
+    app = Sphinx(
+        str(srcdir),
+        str(srcdir),
+        str(outdir),
+        str(outdir / ".doctrees"),
+        "text",
+        status=None,
+        warning=warnings,
+        freshenv=True,
+    )
+    app.build()
+
+    assert "heavydep" not in warnings.getvalue()
+    assert "A thing." in (outdir / "index.txt").read_text()
+    assert not getattr(app.env, "hy_import_failures", {})
@@ -0,0 +1,43 @@
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from sphinxcontrib.hy_documenters import _stringify, annotation_strings, stringify
+
+
+class Foo:
+    pass
+
+
+NESTED = [
+    Dict[str, List[Foo]],
+    Optional[Dict[str, Union[int, List[Tuple[Foo, ...]]]]],
+    Callable[[Dict[str, List[Foo]], int], Optional[List[Dict[str, Foo]]]],
+    Union[List[Dict[str, Optional[Foo]]], Tuple[int, str, None]],
+]
+
+
+def test_memoized_stringify_matches():
+    annotation_strings.clear()
+    for annotation in NESTED + [int, None, "'Foo'", Union[int, str], Union[str, int]]:
+        assert stringify(annotation) == _stringify(annotation)
+        assert stringify(annotation) == _stringify(annotation)
+
+    # equal, but rendered in their own order
+    assert stringify(Union[int, str]) == "(get Union #(int str))"
+    assert stringify(Union[str, int]) == "(get Union #(str int))"
+    assert stringify([int]) == "[<class 'int'>]"
+
+
+def test_memoized_stringify_is_faster():
+    def render_time(render):
+        best = float("inf")
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(200):
+                for annotation in NESTED:
+                    render(annotation)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    annotation_strings.clear()
+    assert render_time(stringify) * 5 < render_time(_stringify)